@@ -0,0 +1,103 @@
+"""Benchmark: axis ordering, grouping, summaries and rendering scale linearly with row count.
+
+Builds tables with N rows (one cell per row and column), an explicit
+``rows.order`` covering every row, row groups, a delta column and
+row/column summaries, then times ``build_table`` plus rendering for
+doubling N. Each doubling of N should roughly double the time.
+
+Usage:
+    python benchmarks/axis_scaling.py [--max-rows 40000] [--cols 4]
+
+Exits non-zero if the time ratio for any doubling exceeds ``--max-ratio``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from table_generator.pipeline import build_table, compute_highlights  # noqa: E402
+from table_generator.render_html import render_html  # noqa: E402
+from table_generator.render_latex import render_latex  # noqa: E402
+from table_generator.render_markdown import render_markdown  # noqa: E402
+from table_generator.schema import validate_spec  # noqa: E402
+
+
+def make_case(n_rows: int, n_cols: int):
+    rows = [f"ckpt-{idx:06d}" for idx in range(n_rows)]
+    cols = [f"task-{idx}" for idx in range(n_cols)]
+    records = [
+        {"run": row, "task": col, "metric": "acc", "seed": 0, "value": (idx * 7919 + jdx) % 1000 / 10.0}
+        for idx, row in enumerate(rows)
+        for jdx, col in enumerate(cols)
+    ]
+    group_size = 100
+    spec = {
+        "rows": {
+            "field": "run",
+            "order": list(reversed(rows)),
+            "groups": [
+                {"label": f"block {start // group_size}", "members": list(reversed(rows))[start:start + group_size]}
+                for start in range(0, n_rows, group_size)
+            ],
+        },
+        "cols": {"field": "task"},
+        "metric": {"field": "metric", "value": "acc", "direction": "max"},
+        "aggregate": {
+            "over": ["seed"],
+            "row_summary": {"label": "Avg"},
+            "col_summary": {"label": "Mean"},
+        },
+        "delta": {"baseline": rows[0]},
+        "highlight": {"scope": "column", "best": {"style": "bold"}},
+    }
+    return records, validate_spec(spec)
+
+
+def run_once(records, spec) -> float:
+    start = time.perf_counter()
+    table = build_table(records, spec)
+    highlights = compute_highlights(table, spec)
+    render_latex(table, highlights, spec, {})
+    render_markdown(table, highlights, spec, {})
+    render_html(table, highlights, spec, {})
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-rows", type=int, default=2500)
+    parser.add_argument("--max-rows", type=int, default=40000)
+    parser.add_argument("--cols", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-ratio", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'seconds':>10} {'us/row':>10} {'ratio':>7}")
+    previous = None
+    worst = 0.0
+    n_rows = args.min_rows
+    while n_rows <= args.max_rows:
+        records, spec = make_case(n_rows, args.cols)
+        # validate_spec deep-copies, and delta columns rewrite spec groups per build.
+        best = min(run_once(records, validate_spec(spec)) for _ in range(args.repeat))
+        ratio = best / previous if previous else float("nan")
+        if previous:
+            worst = max(worst, ratio)
+        print(f"{n_rows:>8} {best:>10.3f} {best / n_rows * 1e6:>10.1f} {ratio:>7.2f}")
+        previous = best
+        n_rows *= 2
+
+    if worst > args.max_ratio:
+        print(f"Superlinear scaling: worst doubling ratio {worst:.2f} > {args.max_ratio}")
+        return 1
+    print(f"Linear scaling: worst doubling ratio {worst:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
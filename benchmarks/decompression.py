@@ -0,0 +1,94 @@
+"""Benchmark: streaming JSONL loading from gzip, xz and bz2 files against the plain file.
+
+Writes N long-form records as plain ``.jsonl`` and as ``.jsonl.gz``,
+``.jsonl.xz`` and ``.jsonl.bz2`` into a temporary directory, then times
+``iter_jsonl_records`` with a spec (metric filter plus projection) over
+each. Throughput is reported in MB/s of uncompressed JSONL; records are
+decompressed while they are read and never written out uncompressed.
+
+Usage:
+    python benchmarks/decompression.py [--records 200000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from table_generator.loaders import iter_jsonl_records  # noqa: E402
+from table_generator.schema import validate_spec  # noqa: E402
+
+CODECS = {".gz": gzip.open, ".xz": lzma.open, ".bz2": bz2.open}
+
+
+def make_case(n_records: int):
+    metrics = ["acc", "f1", "loss"]
+    lines = [
+        json.dumps(
+            {
+                "method": f"method-{idx % 12}",
+                "dataset": f"task-{idx % 8}",
+                "seed": idx % 20,
+                "metric": metrics[idx % 3],
+                "value": (idx * 7919) % 1000 / 1000.0,
+                "run_id": f"run-{idx:08d}",
+            }
+        )
+        for idx in range(n_records)
+    ]
+    spec = {
+        "rows": {"field": "method"},
+        "cols": {"field": "dataset"},
+        "metric": {"field": "metric", "value": "acc", "direction": "max"},
+        "aggregate": {"over": ["seed"]},
+    }
+    return ("\n".join(lines) + "\n").encode("utf-8"), validate_spec(spec)
+
+
+def run_once(path: str, spec) -> float:
+    start = time.perf_counter()
+    for _ in iter_jsonl_records(path, spec):
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data, spec = make_case(args.records)
+    size_mb = len(data) / 1e6
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"": os.path.join(tmp, "records.jsonl")}
+        with open(paths[""], "wb") as handle:
+            handle.write(data)
+        for ext, opener in CODECS.items():
+            paths[ext] = paths[""] + ext
+            with opener(paths[ext], "wb") as handle:
+                handle.write(data)
+
+        print(f"{args.records} records, {size_mb:.1f} MB uncompressed")
+        print(f"{'file':>17} {'MB on disk':>11} {'seconds':>9} {'MB/s':>8} {'vs plain':>9}")
+        plain = None
+        for ext, path in paths.items():
+            best = min(run_once(path, spec) for _ in range(args.repeat))
+            plain = plain or best
+            on_disk = os.path.getsize(path) / 1e6
+            name = "records.jsonl" + ext
+            print(f"{name:>17} {on_disk:>11.1f} {best:>9.3f} {size_mb / best:>8.1f} {best / plain:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+"""Benchmark: rendering from the ``.tgcols`` sidecar against parsing the records file.
+
+Writes N long-form records (3-decimal values, as results files usually
+hold) to a temporary JSONL file. Each spec is then rendered three ways:
+from records parsed on every run (``--no-records-cache``), from a cold
+sidecar (parsed, then written) and from a warm sidecar (memory-mapped).
+The sidecar feeds the columnar engine and parsed records the record
+engine, so this also checks that both engines print the same tables.
+
+Usage:
+    python benchmarks/records_cache.py [--records 300000] [--repeat 3]
+
+Exits non-zero if any spec renders differently through the sidecar.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from table_generator.api import render_table  # noqa: E402
+from table_generator.loaders import iter_records  # noqa: E402
+from table_generator.records_cache import load_columns, sidecar_path  # noqa: E402
+from table_generator.schema import validate_spec  # noqa: E402
+
+UNCERTAINTIES = {
+    "mean-std": ("mean", {"type": "std"}),
+    "mean-sem": ("mean", {"type": "sem"}),
+    "mean-t": ("mean", {"type": "ci", "method": "t_interval"}),
+    "median": ("median", {"type": "none"}),
+}
+
+
+def make_case(n_records: int):
+    metrics = ["acc", "f1", "loss"]
+    records = [
+        {
+            "method": f"method-{idx % 40}",
+            "dataset": f"task-{(idx // 40) % 25}",
+            "seed": idx // 1000,
+            "metric": metrics[idx % 3],
+            "value": round(70 + (idx * 7919) % 20011 / 1000.0, 3),
+        }
+        for idx in range(n_records)
+    ]
+    specs = {}
+    for name, (stat, unc) in UNCERTAINTIES.items():
+        specs[name] = validate_spec(
+            {
+                "rows": {"field": "method"},
+                "cols": {"field": "dataset"},
+                "metric": {"field": "metric", "value": "acc", "direction": "max"},
+                "aggregate": {"over": ["seed"], "stat": stat, "uncertainty": unc},
+                "format": {"mean_decimals": 3, "unc_decimals": 4},
+                "output": {"format": "markdown"},
+            }
+        )
+    return records, specs
+
+
+def best_of(repeat: int, fn):
+    """(fastest seconds, result) over ``repeat`` calls of ``fn``."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        runs.append((time.perf_counter() - start, result))
+    return min(runs, key=lambda run: run[0])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=300000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records, specs = make_case(args.records)
+    failed = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "records.jsonl")
+        with open(path, "w", encoding="utf-8") as handle:
+            for rec in records:
+                handle.write(json.dumps(rec) + "\n")
+        print(f"{args.records} records")
+        print(f"{'spec':>9} {'parse s':>9} {'cold s':>9} {'warm s':>9}  same output")
+        for name, spec in specs.items():
+            def parse_render():
+                return render_table(list(iter_records(path, [spec])), spec)["text"]
+
+            def sidecar_render():
+                return render_table(load_columns(path), spec)["text"]
+
+            parsed = best_of(args.repeat, parse_render)
+            if os.path.exists(sidecar_path(path)):
+                os.unlink(sidecar_path(path))
+            cold = best_of(1, sidecar_render)
+            warm = best_of(args.repeat, sidecar_render)
+            same = parsed[1] == cold[1] == warm[1]
+            if not same:
+                failed.append(name)
+            print(f"{name:>9} {parsed[0]:>9.3f} {cold[0]:>9.3f} {warm[0]:>9.3f}  {'yes' if same else 'NO'}")
+    if failed:
+        print(f"Sidecar output differs for: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,10 @@
 """Public API for table_generator."""
 
-from .api import render_table  # noqa: F401
+from .api import render_many, render_table  # noqa: F401
+from .cache import BootstrapCache  # noqa: F401
+from .columnar import RecordColumns  # noqa: F401
+from .incremental import IncrementalTable  # noqa: F401
 from .schema import SchemaError  # noqa: F401
+from .sqlite_records import SqliteRecords  # noqa: F401
 
-__all__ = ["render_table", "SchemaError"]
+__all__ = ["render_table", "render_many", "BootstrapCache", "IncrementalTable", "RecordColumns", "SchemaError", "SqliteRecords"]
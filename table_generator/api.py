@@ -2,16 +2,61 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import copy
+import json
+from typing import Any, Dict, Iterable, List, Sequence
 
+from .cache import BootstrapCache
+from .columnar import RecordColumns
+from .index import RecordIndex
 from .pipeline import render_pipeline
 from .schema import validate_spec
+from .sqlite_records import SqliteRecords
 
 
-def render_table(records: List[Dict[str, Any]], spec: Dict[str, Any]) -> Dict[str, Any]:
+def render_table(
+    records: List[Dict[str, Any]],
+    spec: Dict[str, Any],
+    cache: BootstrapCache | None = None,
+    jobs: int = 1,
+) -> Dict[str, Any]:
     """Render a table from records and spec.
 
+    Pass a ``BootstrapCache`` to reuse bootstrap CI and significance results
+    across calls. ``jobs`` spreads per-cell bootstrap work over that many
+    worker processes (``0`` uses every core); results do not depend on it.
+
     Returns a dict with keys: format, text, preamble, meta.
     """
     validated = validate_spec(spec)
-    return render_pipeline(records, validated)
+    return render_pipeline(records, validated, cache, jobs)
+
+
+def render_many(
+    records: Iterable[Dict[str, Any]] | RecordIndex | RecordColumns | SqliteRecords,
+    specs: Sequence[Dict[str, Any]],
+    cache: BootstrapCache | None = None,
+    jobs: int = 1,
+) -> List[Dict[str, Any]]:
+    """Render one table per spec from a single shared record index.
+
+    Records are bucketed by metric value once; specs that select the same
+    records with the same rows, cols, renames and aggregation share one
+    grouping pass. Identical specs are validated once.
+
+    ``RecordColumns`` and ``SqliteRecords`` are used as is: each spec is
+    grouped by the columnar engine, or in SQL.
+
+    Returns a list of ``render_table`` results in spec order.
+    """
+    shared = (RecordIndex, RecordColumns, SqliteRecords)
+    index = records if isinstance(records, shared) else RecordIndex(records)
+    validated: Dict[str, Dict[str, Any]] = {}
+    results = []
+    for spec in specs:
+        key = json.dumps(spec, sort_keys=True, default=str)
+        if key not in validated:
+            validated[key] = validate_spec(spec)
+        # Later stages may annotate the spec, so each table gets its own copy.
+        results.append(render_pipeline(index, copy.deepcopy(validated[key]), cache, jobs))
+    return results
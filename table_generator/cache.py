@@ -0,0 +1,227 @@
+"""Persistent on-disk cache for bootstrap results.
+
+Bootstrap CIs are deterministic given the cell values, statistic, level,
+number of replicates, seed and backend, so results can be reused across
+invocations. Entries live in a single SQLite file and are evicted in
+least-recently-used order once the cache grows past ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+CACHE_VERSION = 3
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+_DB_NAME = "bootstrap.sqlite3"
+# Keys per ``IN (...)`` lookup; stays under SQLite's host-parameter limit.
+_LOOKUP_CHUNK = 500
+
+
+def default_cache_dir() -> str:
+    """Return ``$TABLEGEN_CACHE_DIR``, else ``$XDG_CACHE_HOME/tablegen``, else ``~/.cache/tablegen``."""
+    env = os.environ.get("TABLEGEN_CACHE_DIR")
+    if env:
+        return env
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tablegen")
+
+
+def cache_key(kind: str, vectors: Sequence[Sequence[float]], params: Dict[str, Any]) -> str:
+    """Content hash of the value vectors plus the parameters that affect the result."""
+    digest = hashlib.sha256()
+    header = {"version": CACHE_VERSION, "kind": kind, "params": params}
+    digest.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+    for vector in vectors:
+        digest.update(struct.pack("<q", len(vector)))
+        digest.update(struct.pack(f"<{len(vector)}d", *vector))
+    return digest.hexdigest()
+
+
+class BootstrapCache:
+    """Content-addressed store for bootstrap results with size-based LRU eviction.
+
+    Cache failures (e.g., a read-only home directory) are never fatal: the
+    affected lookup simply falls back to recomputing.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        # Running total of entry sizes, read once per connection and then
+        # kept up to date by writes, so eviction does not rescan the table.
+        self._total: Optional[int] = None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None or self._disabled:
+            return self._conn
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.path, _DB_NAME))
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, atime REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_atime ON entries (atime)")
+            conn.commit()
+        except (OSError, sqlite3.Error):
+            self._disabled = True
+            return None
+        self._conn = conn
+        return conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            self._total = None
+
+    def get(self, key: str) -> Any:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: Sequence[str]) -> List[Any]:
+        """Look up ``keys`` in batched queries; misses are None. Hits are touched in one commit."""
+        results: List[Any] = [None] * len(keys)
+        conn = self._connect()
+        if conn is None or not keys:
+            return results
+        found: Dict[str, str] = {}
+        try:
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), _LOOKUP_CHUNK):
+                chunk = unique[start : start + _LOOKUP_CHUNK]
+                marks = ", ".join("?" * len(chunk))
+                found.update(conn.execute(f"SELECT key, value FROM entries WHERE key IN ({marks})", chunk))
+            if found:
+                now = time.time()
+                conn.executemany("UPDATE entries SET atime = ? WHERE key = ?", [(now, key) for key in found])
+                conn.commit()
+        except sqlite3.Error:
+            return results
+        for idx, key in enumerate(keys):
+            if key in found:
+                results[idx] = json.loads(found[key])
+        return results
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Sequence[Tuple[str, Any]]) -> None:
+        """Store ``(key, value)`` pairs in one transaction, evicting at most once."""
+        conn = self._connect()
+        if conn is None or not items:
+            return
+        now = time.time()
+        rows = []
+        for key, value in items:
+            text = json.dumps(value)
+            rows.append((key, text, len(text), now))
+        try:
+            if self._total is None:
+                self._total = self._stored_bytes(conn)
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, atime) VALUES (?, ?, ?, ?)", rows
+            )
+            self._total += sum(row[2] for row in rows)
+            if self._total > self.max_bytes:
+                self._evict(conn)
+            conn.commit()
+        except sqlite3.Error:
+            self._total = None
+            return
+
+    @staticmethod
+    def _stored_bytes(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # The running total is an upper bound (replaced keys and other
+        # processes are not tracked); recount before deleting anything.
+        total = self._stored_bytes(conn)
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            doomed: List[str] = []
+            for key, size in conn.execute("SELECT key, size FROM entries ORDER BY atime ASC"):
+                doomed.append(key)
+                excess -= size
+                total -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in doomed])
+        self._total = total
+
+    def get_or_compute(
+        self,
+        kind: str,
+        vectors: Sequence[Sequence[float]],
+        params: Dict[str, Any],
+        compute: Callable[[], Any],
+    ) -> Any:
+        key = cache_key(kind, vectors, params)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def get_or_compute_many(
+        self,
+        tasks: Sequence[Tuple[str, Sequence[Sequence[float]], Dict[str, Any]]],
+        compute_many: Callable[[List[Any]], List[Any]],
+    ) -> List[Any]:
+        """Batch form of ``get_or_compute``; misses are computed in one ``compute_many`` call."""
+        keys = [cache_key(kind, vectors, params) for kind, vectors, params in tasks]
+        results = self.get_many(keys)
+        pending = [idx for idx, value in enumerate(results) if value is None]
+        self.hits += len(tasks) - len(pending)
+        self.misses += len(pending)
+        if pending:
+            computed = compute_many([tasks[idx] for idx in pending])
+            for idx, value in zip(pending, computed):
+                results[idx] = value
+            self.put_many([(keys[idx], results[idx]) for idx in pending])
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        entries, size = 0, 0
+        if conn is not None:
+            try:
+                entries, size = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+            except sqlite3.Error:
+                pass
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> int:
+        conn = self._connect()
+        if conn is None:
+            return 0
+        try:
+            removed = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            conn.execute("DELETE FROM entries")
+            conn.commit()
+            self._total = 0
+            conn.execute("VACUUM")
+        except sqlite3.Error:
+            return 0
+        return removed
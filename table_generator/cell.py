@@ -0,0 +1,104 @@
+"""Compact table cells.
+
+A ``Cell`` stores its fields in ``__slots__`` instead of a per-cell dict,
+but keeps the mapping interface (``cell["center"]``, ``cell.get("delta")``,
+``cell["ci"] = (lo, hi)``), so renderers and exporters that read cells as
+dicts work unchanged. ``ci`` is held as two floats rather than a tuple.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from typing import Any, Iterator, List, Optional, Tuple
+
+# Keys every cell reports, even when unset (None).
+_BASE_KEYS = ("center", "n", "unc", "ci", "values")
+# Keys reported only when set.
+_OPTIONAL_KEYS = ("mean", "sd", "n_boot", "sig_n_boot", "over_keys", "delta", "delta_mode")
+_KEYS = frozenset(_BASE_KEYS + _OPTIONAL_KEYS)
+
+
+class Cell(MutableMapping):
+    """One table cell: center, uncertainty, CI, count and optional raw values."""
+
+    __slots__ = (
+        "center",
+        "n",
+        "unc",
+        "ci_lo",
+        "ci_hi",
+        "values",
+        "mean",
+        "sd",
+        "n_boot",
+        "sig_n_boot",
+        "over_keys",
+        "delta",
+        "delta_mode",
+    )
+
+    def __init__(
+        self,
+        center: Optional[float] = None,
+        n: Optional[int] = None,
+        unc: Optional[float] = None,
+        ci: Optional[Tuple[float, float]] = None,
+        values: Optional[List[float]] = None,
+        **extra: Any,
+    ) -> None:
+        self.center = center
+        self.n = n
+        self.unc = unc
+        self.ci = ci
+        self.values = values
+        for key in _OPTIONAL_KEYS:
+            setattr(self, key, None)
+        for key, value in extra.items():
+            self[key] = value
+
+    @property
+    def ci(self) -> Optional[Tuple[float, float]]:
+        if self.ci_lo is None and self.ci_hi is None:
+            return None
+        return (self.ci_lo, self.ci_hi)
+
+    @ci.setter
+    def ci(self, value: Optional[Tuple[float, float]]) -> None:
+        if value is None:
+            self.ci_lo = self.ci_hi = None
+        else:
+            self.ci_lo, self.ci_hi = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self[key] = None
+
+    def __contains__(self, key: object) -> bool:
+        # Matches __iter__: base keys always, optional keys only when set.
+        if key in _BASE_KEYS:
+            return True
+        return key in _KEYS and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self else default
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _BASE_KEYS
+        for key in _OPTIONAL_KEYS:
+            if getattr(self, key) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Cell({dict(self)!r})"
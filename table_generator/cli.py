@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 import tempfile
 import subprocess
@@ -11,12 +12,31 @@ import sys
 import shutil
 from typing import Any, Dict, List
 
-from .api import render_table
+from .api import render_many
+from .cache import BootstrapCache
 from .schema import SchemaError, validate_spec
 from .templates import DEFAULT_RECORDS, DEFAULT_SPEC
-from .pipeline import build_table, compute_highlights, compute_significance
-from .render_html import render_html
-from .export import build_export_rows, write_export_csv, write_export_json
+from .pipeline import build_table, compute_highlights, compute_significance, render_text
+from .export import (
+    EXPORT_FORMATS,
+    export_format_for,
+    iter_export_rows,
+    write_export_csv,
+    write_export_json,
+    write_export_ndjson,
+    write_export_npz,
+)
+from .loaders import (
+    expand_record_paths,
+    input_format,
+    is_delimited,
+    iter_records,
+    load_shards,
+    read_delimited_columns,
+    records_suffix,
+)
+from .records_cache import load_columns
+from .sqlite_records import SqliteRecords, is_sqlite_url
 
 
 def _load_json(path: str) -> Any:
@@ -24,79 +44,200 @@ def _load_json(path: str) -> Any:
         return json.load(handle)
 
 
-def _load_records(path: str) -> List[Dict[str, Any]]:
-    if path.endswith(".jsonl"):
-        records = []
-        with open(path, "r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                records.append(json.loads(line))
-        return records
-    data = _load_json(path)
-    if not isinstance(data, list):
-        raise ValueError("Records JSON must be a list")
-    return data
+def _load_records(
+    values: List[str],
+    specs: List[Dict[str, Any]],
+    fmt: str | None = None,
+    use_cache: bool = True,
+    jobs: int = 1,
+) -> Any:
+    if any(is_sqlite_url(value) for value in values):
+        if len(values) > 1:
+            raise ValueError("A sqlite:/// records source cannot be combined with other --records")
+        # Filtering and grouping run inside the database.
+        return SqliteRecords.from_url(values[0])
+    paths = expand_record_paths(values)
+    fmt = input_format(specs, fmt)
+    if len(paths) > 1:
+        # Shards are parsed in parallel, each filtered and projected by its worker.
+        return load_shards(paths, specs, fmt, jobs)
+    path = paths[0]
+    if fmt == "records" and use_cache and records_suffix(path) in (".json", ".jsonl"):
+        # Memory-mapped columns from the sidecar cache (built on first load).
+        columns = load_columns(path)
+        if columns is not None:
+            return columns
+    if fmt == "records" and len(specs) == 1 and is_delimited(path):
+        # CSV/TSV for one table goes straight to typed columns (no per-row dicts).
+        return read_delimited_columns(path, specs[0])
+    # Streams the file where the format allows, keeping only records (and fields) the specs read.
+    return list(iter_records(path, specs, fmt))
+
+
+def _close_records(records: Any) -> None:
+    if isinstance(records, SqliteRecords):
+        records.close()
+
+
+RENDER_FORMATS = ("latex", "markdown", "html")
+
+
+def _parse_formats(value: str) -> List[str]:
+    formats = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [fmt for fmt in formats if fmt not in RENDER_FORMATS]
+    if unknown or not formats:
+        raise ValueError(f"--format must list formats from {', '.join(RENDER_FORMATS)}")
+    return list(dict.fromkeys(formats))
+
+
+def _output_paths(values: List[str], formats: List[str]) -> Dict[str, str]:
+    """Map each format to its --out path (``FORMAT=PATH``; a bare path for a single format)."""
+    paths: Dict[str, str] = {}
+    for value in values:
+        fmt, sep, path = value.partition("=")
+        if sep and fmt in RENDER_FORMATS:
+            if fmt not in formats:
+                raise ValueError(f"--out given for '{fmt}', which is not in --format")
+            paths[fmt] = path
+        elif len(formats) == 1:
+            paths[formats[0]] = value
+        else:
+            raise ValueError("With several formats, --out must be FORMAT=PATH")
+    return paths
+
+
+def _open_in_browser(target: str) -> None:
+    opener = None
+    if sys.platform.startswith("darwin"):
+        opener = "open"
+    elif sys.platform.startswith("linux"):
+        opener = "xdg-open"
+    elif sys.platform.startswith("win"):
+        opener = "start"
+    if opener and (opener == "start" or shutil.which(opener)):
+        if opener == "start":
+            subprocess.run(["cmd", "/c", "start", "", target], check=False)
+        else:
+            subprocess.run([opener, target], check=False)
+    else:
+        print("Warning: could not auto-open preview; please open the HTML file manually.", file=sys.stderr)
 
 
 def cmd_render(args: argparse.Namespace) -> int:
+    records = None
+    cache = None
     try:
-        records = _load_records(args.records)
         spec = _load_json(args.spec)
         validated = validate_spec(spec)
-        table = build_table(records, validated)
-        highlights = compute_highlights(table, validated)
-        markers = compute_significance(table, validated)
-
         if args.preview:
-            text = render_html(table, highlights, validated, markers)
-            result = {"text": text}
+            formats = ["html"]
+        elif args.format:
+            formats = _parse_formats(args.format)
         else:
-            result = render_table(records, validated)
+            formats = [validated["output"]["format"]]
+        out_paths = _output_paths(args.out or [], formats)
+        export_format = args.export and (args.export_format or export_format_for(args.export))
+        if args.export_values:
+            if export_format != "npz":
+                raise ValueError("--export-values requires an npz --export")
+            if validated["aggregate"].get("low_memory"):
+                raise ValueError("--export-values cannot be combined with aggregate.low_memory")
+            # Streamed cells drop their raw values unless the spec keeps them.
+            validated["aggregate"]["keep_values"] = True
+        records = _load_records(
+            args.records, [validated], args.input_format, not args.no_records_cache, args.jobs
+        )
+        cache = None if args.no_cache else BootstrapCache(args.cache_dir)
+        # Everything below renders from this single computation.
+        table = build_table(records, validated, cache, args.jobs)
+        highlights = compute_highlights(table, validated)
+        markers = compute_significance(table, validated, cache, args.jobs)
+        texts = {fmt: render_text(table, highlights, markers, validated, fmt)[0] for fmt in formats}
     except (SchemaError, ValueError) as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 2
+    finally:
+        _close_records(records)
+        if cache is not None:
+            cache.close()
 
-    text = result["text"]
-    out_path = args.out
-    if args.preview and args.open and not out_path:
+    open_html = args.open and "html" in formats
+    if open_html and "html" not in out_paths:
         temp = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-        out_path = temp.name
+        out_paths["html"] = temp.name
         temp.close()
 
-    if out_path:
-        with open(out_path, "w", encoding="utf-8") as handle:
-            handle.write(text)
-    print(text)
+    for fmt in formats:
+        text = texts[fmt]
+        out_path = out_paths.get(fmt)
+        if out_path:
+            with open(out_path, "w", encoding="utf-8") as handle:
+                handle.write(text)
+        if len(formats) == 1 or not out_path:
+            print(text)
 
-    if args.preview and args.open:
-        target = out_path
-        if target:
-            opener = None
-            if sys.platform.startswith("darwin"):
-                opener = "open"
-            elif sys.platform.startswith("linux"):
-                opener = "xdg-open"
-            elif sys.platform.startswith("win"):
-                opener = "start"
-            if opener and (opener == "start" or shutil.which(opener)):
-                if opener == "start":
-                    subprocess.run(["cmd", "/c", "start", "", target], check=False)
-                else:
-                    subprocess.run([opener, target], check=False)
-            else:
-                print("Warning: could not auto-open preview; please open the HTML file manually.", file=sys.stderr)
+    if open_html:
+        _open_in_browser(out_paths["html"])
 
     if args.export:
-        export_rows = build_export_rows(table, highlights, markers)
-        export_format = args.export_format
-        if export_format is None:
-            export_format = "csv" if args.export.endswith(".csv") else "json"
-        if export_format == "csv":
+        # Rows are generated and written one at a time.
+        export_rows = iter_export_rows(table, highlights, markers)
+        if export_format == "npz":
+            try:
+                write_export_npz(args.export, table, highlights, markers, args.export_values)
+            except ValueError as exc:
+                print(f"Error: {exc}", file=sys.stderr)
+                return 2
+        elif export_format == "csv":
             write_export_csv(args.export, export_rows)
+        elif export_format == "ndjson":
+            write_export_ndjson(args.export, export_rows)
         else:
-            write_export_json(args.export, export_rows)
+            write_export_json(args.export, export_rows, None if args.export_compact else 2)
+    return 0
+
+
+def cmd_render_many(args: argparse.Namespace) -> int:
+    records = None
+    cache = None
+    try:
+        validated = [validate_spec(_load_json(path)) for path in args.spec]
+        records = _load_records(
+            args.records, validated, args.input_format, not args.no_records_cache, args.jobs
+        )
+        cache = None if args.no_cache else BootstrapCache(args.cache_dir)
+        results = render_many(records, validated, cache, args.jobs)
+    except (SchemaError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        _close_records(records)
+        if cache is not None:
+            cache.close()
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    for path, result in zip(args.spec, results):
+        text = result["text"]
+        if args.out_dir:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            ext = ".tex" if result["format"] == "latex" else ".md"
+            with open(os.path.join(args.out_dir, stem + ext), "w", encoding="utf-8") as handle:
+                handle.write(text)
+        else:
+            print(f"% {path}" if result["format"] == "latex" else f"<!-- {path} -->")
+            print(text)
+    return 0
+
+
+def cmd_cache(args: argparse.Namespace) -> int:
+    cache = BootstrapCache(args.cache_dir)
+    if args.action == "clear":
+        removed = cache.clear()
+        print(f"Removed {removed} cache entries from {cache.path}")
+    else:
+        print(json.dumps(cache.stats(), indent=2))
+    cache.close()
     return 0
 
 
@@ -115,32 +256,139 @@ def build_parser() -> argparse.ArgumentParser:
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     render = subparsers.add_parser("render", help="Render a table")
-    render.add_argument("--records", required=True, help="Path to records JSON/JSONL")
+    render.add_argument(
+        "--records",
+        required=True,
+        nargs="+",
+        action="extend",
+        help="Records JSON/JSONL/CSV/TSV files or glob patterns, or sqlite:///path.db?table=NAME",
+    )
+    render.add_argument(
+        "--input-format",
+        choices=["records", "nested"],
+        required=False,
+        help="Records layout: flat records or nested per-method results (default: spec input.format)",
+    )
     render.add_argument("--spec", required=True, help="Path to spec JSON")
-    render.add_argument("--out", required=False, help="Optional output path")
+    render.add_argument(
+        "--format",
+        required=False,
+        help="Comma-separated output formats: latex, markdown, html (default: spec output.format)",
+    )
+    render.add_argument(
+        "--out",
+        action="append",
+        required=False,
+        help="Output path; repeat as FORMAT=PATH when rendering several formats",
+    )
     render.add_argument(
         "--preview",
         action="store_true",
-        help="Render an HTML preview instead of the main output",
+        help="Render an HTML preview instead of the main output (same as --format html)",
     )
     render.add_argument(
         "--open",
         action="store_true",
-        help="Open the HTML preview in the default browser (best-effort)",
+        help="Open the HTML output in the default browser (best-effort)",
     )
     render.add_argument(
         "--export",
         required=False,
-        help="Write computed stats to a JSON or CSV file",
+        help="Write computed stats to a JSON, NDJSON, CSV or NPZ file",
     )
     render.add_argument(
         "--export-format",
-        choices=["json", "csv"],
+        choices=list(EXPORT_FORMATS),
         required=False,
-        help="Export format (defaults to JSON unless path ends with .csv)",
+        help="Export format (default: by extension: .csv, .npz, .ndjson/.jsonl; else json)",
+    )
+    render.add_argument(
+        "--export-compact",
+        action="store_true",
+        help="Write JSON exports without indentation",
+    )
+    render.add_argument(
+        "--export-values",
+        action="store_true",
+        help="Include each cell's raw values in npz exports (ragged offsets + data arrays)",
+    )
+    render.add_argument(
+        "--no-records-cache",
+        action="store_true",
+        help="Parse JSON/JSONL records every time instead of using the <records>.tgcols sidecar",
+    )
+    render.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk bootstrap cache",
+    )
+    render.add_argument(
+        "--cache-dir",
+        required=False,
+        help="Bootstrap cache directory (default: ~/.cache/tablegen)",
+    )
+    render.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for record shards, bootstrap CIs and significance (0 = all cores)",
     )
     render.set_defaults(func=cmd_render)
 
+    render_many = subparsers.add_parser(
+        "render-many", help="Render several tables from one records file"
+    )
+    render_many.add_argument(
+        "--records",
+        required=True,
+        nargs="+",
+        action="extend",
+        help="Records JSON/JSONL/CSV/TSV files or glob patterns, or sqlite:///path.db?table=NAME",
+    )
+    render_many.add_argument(
+        "--input-format",
+        choices=["records", "nested"],
+        required=False,
+        help="Records layout: flat records or nested per-method results (default: spec input.format)",
+    )
+    render_many.add_argument("--spec", required=True, nargs="+", help="Paths to spec JSON files")
+    render_many.add_argument(
+        "--out-dir",
+        required=False,
+        help="Write each table to <out-dir>/<spec name>.tex/.md instead of stdout",
+    )
+    render_many.add_argument(
+        "--no-records-cache",
+        action="store_true",
+        help="Parse JSON/JSONL records every time instead of using the <records>.tgcols sidecar",
+    )
+    render_many.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk bootstrap cache",
+    )
+    render_many.add_argument(
+        "--cache-dir",
+        required=False,
+        help="Bootstrap cache directory (default: ~/.cache/tablegen)",
+    )
+    render_many.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for record shards, bootstrap CIs and significance (0 = all cores)",
+    )
+    render_many.set_defaults(func=cmd_render_many)
+
+    cache = subparsers.add_parser("cache", help="Inspect or clear the bootstrap cache")
+    cache.add_argument("action", choices=["clear", "stats"], help="Cache action")
+    cache.add_argument(
+        "--cache-dir",
+        required=False,
+        help="Bootstrap cache directory (default: ~/.cache/tablegen)",
+    )
+    cache.set_defaults(func=cmd_cache)
+
     template = subparsers.add_parser("template", help="Emit a default spec + records example")
     template.add_argument("--out", required=False, help="Optional output path")
     template.set_defaults(func=cmd_template)
@@ -0,0 +1,283 @@
+"""Columnar record storage and group-by aggregation.
+
+``RecordColumns`` holds records as interned label columns (integer codes
+into a label list) plus one contiguous float array of values. Grouping
+works on integer cell codes: with NumPy via a stable sort or ``bincount``,
+otherwise with a single pass over the codes.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .stats import RunningStats, np
+
+
+class LabelColumn:
+    """Interned label column: ``labels[codes[i]]`` is the label of record ``i``."""
+
+    __slots__ = ("labels", "codes", "_index")
+
+    def __init__(self, labels: Optional[List[Any]] = None, codes: Optional[array] = None) -> None:
+        self.labels: List[Any] = list(labels or [])
+        self.codes = codes if codes is not None else array("q")
+        self._index = {label: code for code, label in enumerate(self.labels)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def intern(self, label: Any) -> int:
+        code = self._index.get(label)
+        if code is None:
+            code = self._index[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def append(self, label: Any) -> None:
+        self.codes.append(self.intern(label))
+
+    def code_of(self, label: Any) -> Optional[int]:
+        return self._index.get(label)
+
+
+class RecordColumns:
+    """Column-oriented record set.
+
+    ``labels`` maps each label field to a ``LabelColumn`` and ``values`` holds
+    every record's ``value`` as a float. ``filters`` records equality filters
+    already applied while building the columns (e.g. ``{"metric": "acc"}``), so
+    the filtered field need not be stored.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.labels: Dict[str, LabelColumn] = {field: LabelColumn() for field in fields}
+        self.values = array("d")
+        self.filters: Dict[str, Any] = dict(filters or {})
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        for field, column in self.labels.items():
+            column.append(record.get(field))
+        self.values.append(float(record["value"]))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield records as dicts (slow path for code that needs mappings)."""
+        columns = list(self.labels.items())
+        for idx, value in enumerate(self.values):
+            record = dict(self.filters)
+            for field, column in columns:
+                record[field] = column.labels[column.codes[idx]]
+            record["value"] = value
+            yield record
+
+
+def concat_columns(parts: Iterable[RecordColumns]) -> RecordColumns:
+    """Concatenate record sets with the same fields, re-interning each part's labels."""
+    merged: Optional[RecordColumns] = None
+    for part in parts:
+        if merged is None:
+            merged = RecordColumns(list(part.labels), part.filters)
+        for field, column in part.labels.items():
+            target = merged.labels[field]
+            mapping = [target.intern(label) for label in column.labels]
+            if np is not None and mapping:
+                codes = np.asarray(mapping, dtype=np.int64)[np.frombuffer(column.codes, dtype=np.int64)]
+                target.codes.frombytes(codes.tobytes())
+            else:
+                target.codes.extend(map(mapping.__getitem__, column.codes))
+        merged.values.extend(part.values)
+    return merged if merged is not None else RecordColumns([])
+
+
+def spec_fields(spec: Dict[str, Any]) -> List[str]:
+    """Label fields a spec reads besides the metric field: row, col, then ``aggregate.over``."""
+    fields = [spec["rows"]["field"], spec["cols"]["field"]]
+    for field in spec["aggregate"]["over"]:
+        if field not in fields:
+            fields.append(field)
+    return fields
+
+
+def columns_from_records(records: Iterable[Dict[str, Any]], spec: Dict[str, Any]) -> RecordColumns:
+    """Intern the fields ``spec`` reads from records matching its metric."""
+    metric_field = spec["metric"]["field"]
+    metric_value = spec["metric"]["value"]
+    row_field = spec["rows"]["field"]
+    col_field = spec["cols"]["field"]
+    columns = RecordColumns(spec_fields(spec), filters={metric_field: metric_value})
+    for rec in records:
+        if metric_field not in rec:
+            raise ValueError(f"Missing metric field '{metric_field}' in record")
+        if rec[metric_field] != metric_value:
+            continue
+        if row_field not in rec or col_field not in rec:
+            raise ValueError("Record missing row/col field")
+        if "value" not in rec:
+            raise ValueError("Record missing 'value'")
+        columns.append(rec)
+    return columns
+
+
+def _selected_indices(columns: RecordColumns, field: str, value: Any) -> Any:
+    if field not in columns.labels:
+        if field in columns.filters and columns.filters[field] == value:
+            return None  # every record already matches
+        if field in columns.filters:
+            return []
+        raise ValueError(f"Missing metric field '{field}' in record")
+    column = columns.labels[field]
+    code = column.code_of(value)
+    if code is None:
+        return []
+    if np is not None:
+        return np.flatnonzero(np.frombuffer(column.codes, dtype=np.int64) == code)
+    return [idx for idx, c in enumerate(column.codes) if c == code]
+
+
+def _axis_codes(
+    column: LabelColumn, raw_codes: Any, rename: Optional[Dict[Any, Any]]
+) -> Tuple[List[Any], Any]:
+    """Return (labels in first-seen order after renaming, final code per record)."""
+    rename = rename or {}
+    final_labels: List[Any] = []
+    final_index: Dict[Any, int] = {}
+    if np is not None:
+        raw_codes = np.asarray(raw_codes, dtype=np.int64)
+        uniq, first = np.unique(raw_codes, return_index=True)
+        mapping = np.zeros(len(column.labels), dtype=np.int64)
+        for raw in uniq[np.argsort(first, kind="stable")]:
+            label = rename.get(column.labels[raw], column.labels[raw])
+            if label not in final_index:
+                final_index[label] = len(final_labels)
+                final_labels.append(label)
+            mapping[raw] = final_index[label]
+        return final_labels, mapping[raw_codes]
+    mapping_py: Dict[int, int] = {}
+    out = []
+    for raw in raw_codes:
+        code = mapping_py.get(raw)
+        if code is None:
+            label = rename.get(column.labels[raw], column.labels[raw])
+            if label not in final_index:
+                final_index[label] = len(final_labels)
+                final_labels.append(label)
+            code = mapping_py[raw] = final_index[label]
+        out.append(code)
+    return final_labels, out
+
+
+def group_columns(
+    columns: RecordColumns,
+    spec: Dict[str, Any],
+    keep_values: bool,
+    keep_over_keys: bool,
+    sketch_error: Optional[float] = None,
+) -> Tuple[List[Any], List[Any], Dict[Tuple[Any, Any], Any], Dict[Tuple[Any, Any], List[Tuple[Any, ...]]]]:
+    """Group columnar records into cells.
+
+    Returns ``(rows, cols, grouped, over_keys)`` in the shape the record-based
+    path of ``pipeline._aggregate`` produces: rows/cols in first-seen order
+    (after renames), and ``grouped`` mapping ``(row, col)`` to either a value
+    list (``keep_values``) or a ``RunningStats``, in first-seen cell order.
+    """
+    rows_spec = spec["rows"]
+    cols_spec = spec["cols"]
+    row_field = rows_spec["field"]
+    col_field = cols_spec["field"]
+    over_fields = spec["aggregate"]["over"]
+    for field in (row_field, col_field):
+        if field not in columns.labels:
+            raise ValueError("Record missing row/col field")
+
+    selected = _selected_indices(columns, spec["metric"]["field"], spec["metric"]["value"])
+    if selected is None:
+        selected = np.arange(len(columns)) if np is not None else range(len(columns))
+    if len(selected) == 0:
+        return [], [], {}, {}
+
+    row_col = columns.labels[row_field]
+    col_col = columns.labels[col_field]
+    if np is not None:
+        raw_rows = np.frombuffer(row_col.codes, dtype=np.int64)[selected]
+        raw_cols = np.frombuffer(col_col.codes, dtype=np.int64)[selected]
+    else:
+        raw_rows = [row_col.codes[idx] for idx in selected]
+        raw_cols = [col_col.codes[idx] for idx in selected]
+    rows, row_codes = _axis_codes(row_col, raw_rows, rows_spec.get("rename"))
+    cols, col_codes = _axis_codes(col_col, raw_cols, cols_spec.get("rename"))
+    n_cols = len(cols)
+
+    over_columns = [columns.labels.get(field) for field in over_fields] if keep_over_keys else []
+
+    def over_key(idx: int) -> Tuple[Any, ...]:
+        return tuple(
+            column.labels[column.codes[idx]] if column is not None else columns.filters.get(field)
+            for field, column in zip(over_fields, over_columns)
+        )
+
+    grouped: Dict[Tuple[Any, Any], Any] = {}
+    over_keys: Dict[Tuple[Any, Any], List[Tuple[Any, ...]]] = {}
+    as_lists = keep_values or sketch_error is not None
+
+    if np is not None:
+        cell_ids = row_codes * n_cols + col_codes
+        values = np.frombuffer(columns.values, dtype=np.float64)[selected]
+        uniq, first = np.unique(cell_ids, return_index=True)
+        ordered_ids = uniq[np.argsort(first, kind="stable")]
+        if as_lists:
+            order = np.argsort(cell_ids, kind="stable")
+            sorted_ids = cell_ids[order]
+            starts = np.searchsorted(sorted_ids, ordered_ids, side="left")
+            stops = np.searchsorted(sorted_ids, ordered_ids, side="right")
+            sorted_values = values[order]
+            for cell_id, start, stop in zip(ordered_ids.tolist(), starts.tolist(), stops.tolist()):
+                key = (rows[cell_id // n_cols], cols[cell_id % n_cols])
+                grouped[key] = sorted_values[start:stop].tolist()
+                if keep_over_keys:
+                    over_keys[key] = [over_key(int(selected[i])) for i in order[start:stop].tolist()]
+        else:
+            size = len(rows) * n_cols
+            counts = np.bincount(cell_ids, minlength=size)
+            sums = np.bincount(cell_ids, weights=values, minlength=size)
+            means = sums / np.maximum(counts, 1)
+            m2 = np.bincount(cell_ids, weights=(values - means[cell_ids]) ** 2, minlength=size)
+            for cell_id in ordered_ids.tolist():
+                key = (rows[cell_id // n_cols], cols[cell_id % n_cols])
+                grouped[key] = RunningStats.from_moments(
+                    int(counts[cell_id]), float(sums[cell_id]), float(m2[cell_id])
+                )
+    else:
+        by_id: Dict[int, Any] = {}
+        for pos, idx in enumerate(selected):
+            cell_id = row_codes[pos] * n_cols + col_codes[pos]
+            value = columns.values[idx]
+            group = by_id.get(cell_id)
+            if group is None:
+                group = by_id[cell_id] = [] if as_lists else RunningStats()
+                if keep_over_keys:
+                    over_keys[(rows[cell_id // n_cols], cols[cell_id % n_cols])] = []
+            if as_lists:
+                group.append(value)
+                if keep_over_keys:
+                    over_keys[(rows[cell_id // n_cols], cols[cell_id % n_cols])].append(over_key(idx))
+            else:
+                group.push(value)
+        for cell_id, group in by_id.items():
+            grouped[(rows[cell_id // n_cols], cols[cell_id % n_cols])] = group
+
+    if sketch_error is not None and not keep_values:
+        # Stream each cell through its own sketch so results match the
+        # record-based path.
+        for key, values_list in grouped.items():
+            acc = RunningStats(sketch_error)
+            for value in values_list:
+                acc.push(value)
+            grouped[key] = acc
+    return rows, cols, grouped, over_keys
@@ -1,14 +1,27 @@
-"""Export computed table statistics."""
+"""Export computed table statistics.
+
+Rows are produced lazily and every writer streams them to the file one row
+at a time, so peak memory does not grow with the number of cells.
+"""
 
 from __future__ import annotations
 
 import csv
 import json
-from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .schema import HIGHLIGHT_TIERS
+from .stats import np
+
+EXPORT_FORMATS = ("json", "csv", "ndjson", "npz")
+
 
+# Replicate counts, exported after the cell fields when some cell has one.
+_COUNT_FIELDS = ("n_boot", "sig_n_boot")
 
-def _cell_payload(cell: Dict[str, Any]) -> Dict[str, Any]:
+
+def _cell_payload(cell: Dict[str, Any], counts: Tuple[str, ...] = ()) -> Dict[str, Any]:
     payload = {
         "center": cell.get("center"),
         "unc": cell.get("unc"),
@@ -23,19 +36,48 @@ def _cell_payload(cell: Dict[str, Any]) -> Dict[str, Any]:
     else:
         payload["ci_lo"] = None
         payload["ci_hi"] = None
+    for key in counts:
+        payload[key] = cell.get(key)
     return payload
 
 
+def export_format_for(path: str) -> str:
+    """Default export format for ``path``: csv, npz, ndjson (``.ndjson``/``.jsonl``) or json."""
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith(".npz"):
+        return "npz"
+    if path.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "json"
+
+
 def build_export_rows(
     table: Dict[str, Any],
     highlights: Dict[Tuple[Any, Any], str],
     markers: Dict[Tuple[Any, Any], str],
 ) -> List[Dict[str, Any]]:
+    return list(iter_export_rows(table, highlights, markers))
+
+
+def iter_export_rows(
+    table: Dict[str, Any],
+    highlights: Dict[Tuple[Any, Any], str],
+    markers: Dict[Tuple[Any, Any], str],
+) -> Iterator[Dict[str, Any]]:
+    """Yield one export row per (row, col) pair, in table order.
+
+    ``n_boot`` and ``sig_n_boot`` are added as the last fields, and only when
+    some cell of the table has them (a bootstrap ran), so every row, and the
+    CSV header, has the same fields.
+    """
     rows = table["rows"]
     cols = table["cols"]
     cells = table["cells"]
+    counts = tuple(
+        key for key in _COUNT_FIELDS if any(cell.get(key) is not None for cell in cells.values())
+    )
 
-    out: List[Dict[str, Any]] = []
     for r in rows:
         for c in cols:
             cell = cells.get((r, c))
@@ -47,7 +89,7 @@ def build_export_rows(
                 "significant": markers.get((r, c)),
             }
             if cell is not None:
-                payload.update(_cell_payload(cell))
+                payload.update(_cell_payload(cell, counts))
             else:
                 payload.update({
                     "center": None,
@@ -58,21 +100,119 @@ def build_export_rows(
                     "ci_lo": None,
                     "ci_hi": None,
                 })
-            out.append(payload)
-    return out
+                payload.update(dict.fromkeys(counts))
+            yield payload
 
 
-def write_export_json(path: str, rows: Iterable[Dict[str, Any]]) -> None:
-    Path(path).write_text(json.dumps(list(rows), indent=2))
+def write_export_json(path: str, rows: Iterable[Dict[str, Any]], indent: Optional[int] = 2) -> None:
+    """Write rows as a JSON array; ``indent=None`` writes compact JSON on one line."""
+    if indent is None:
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        opening, separator, closing = "[", ",", "]"
+    else:
+        encode = json.JSONEncoder(indent=indent).encode
+        pad = " " * indent
+        opening, separator, closing = "[\n" + pad, ",\n" + pad, "\n]"
+    with open(path, "w", encoding="utf-8") as handle:
+        first = True
+        for row in rows:
+            text = encode(row)
+            if indent is not None:
+                # Nest the row one level inside the array (JSON strings never hold raw newlines).
+                text = text.replace("\n", "\n" + pad)
+            handle.write(opening if first else separator)
+            handle.write(text)
+            first = False
+        handle.write("[]" if first else closing)
+
+
+def write_export_ndjson(path: str, rows: Iterable[Dict[str, Any]]) -> None:
+    """Write one compact JSON object per line."""
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    with open(path, "w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(encode(row))
+            handle.write("\n")
 
 
 def write_export_csv(path: str, rows: Iterable[Dict[str, Any]]) -> None:
-    rows_list = list(rows)
-    if not rows_list:
-        Path(path).write_text("")
-        return
-    fieldnames = list(rows_list[0].keys())
+    rows = iter(rows)
+    first = next(rows, None)
     with open(path, "w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
+        if first is None:
+            return
+        writer = csv.DictWriter(handle, fieldnames=list(first.keys()))
         writer.writeheader()
-        writer.writerows(rows_list)
+        writer.writerows(chain([first], rows))
+
+
+def write_export_npz(
+    path: str,
+    table: Dict[str, Any],
+    highlights: Dict[Tuple[Any, Any], str],
+    markers: Dict[Tuple[Any, Any], str],
+    include_values: bool = False,
+) -> None:
+    """Write the table's statistics as dense ``(rows, cols)`` arrays in one ``.npz`` file.
+
+    Arrays: ``center``, ``unc``, ``ci_lo``, ``ci_hi`` (float64, NaN where
+    unset), ``n`` (int64, 0 for missing cells), ``highlight`` (int8, 0 for
+    none, else the 1-based tier) and ``significant`` (bool). ``header`` holds
+    a JSON string with the row/col labels and the highlight tier names. With
+    ``include_values``, each cell's raw values are stored ragged: cell ``k``
+    (row-major) owns ``values_data[values_offsets[k]:values_offsets[k + 1]]``.
+    Members are stored uncompressed, so ``numpy.load`` reads them without parsing.
+    """
+    if np is None:
+        raise ValueError("npz export requires NumPy")
+    rows = table["rows"]
+    cols = table["cols"]
+    cells = table["cells"]
+    shape = (len(rows), len(cols))
+    arrays = {name: np.full(shape, np.nan) for name in ("center", "unc", "ci_lo", "ci_hi")}
+    arrays["n"] = np.zeros(shape, dtype=np.int64)
+    arrays["highlight"] = np.zeros(shape, dtype=np.int8)
+    arrays["significant"] = np.zeros(shape, dtype=bool)
+    tiers = {tier: idx + 1 for idx, tier in enumerate(HIGHLIGHT_TIERS)}
+    row_index = {row: idx for idx, row in enumerate(rows)}
+    col_index = {col: idx for idx, col in enumerate(cols)}
+    for (r, c), cell in cells.items():
+        i, j = row_index.get(r), col_index.get(c)
+        if i is None or j is None:
+            continue
+        for name in ("center", "unc"):
+            if cell.get(name) is not None:
+                arrays[name][i, j] = cell[name]
+        ci = cell.get("ci")
+        if ci is not None:
+            arrays["ci_lo"][i, j], arrays["ci_hi"][i, j] = ci
+        arrays["n"][i, j] = cell.get("n") or 0
+    for (r, c), tier in highlights.items():
+        if r in row_index and c in col_index:
+            arrays["highlight"][row_index[r], col_index[c]] = tiers[tier]
+    for (r, c), marker in markers.items():
+        if marker and r in row_index and c in col_index:
+            arrays["significant"][row_index[r], col_index[c]] = True
+    if include_values:
+        lengths = np.zeros(shape[0] * shape[1] + 1, dtype=np.int64)
+        chunks = []
+        for i, r in enumerate(rows):
+            for j, c in enumerate(cols):
+                cell = cells.get((r, c))
+                values = cell.get("values") if cell is not None else None
+                if values:
+                    lengths[i * shape[1] + j + 1] = len(values)
+                    chunks.append(np.asarray(values, dtype=np.float64))
+        arrays["values_offsets"] = np.cumsum(lengths)
+        arrays["values_data"] = np.concatenate(chunks) if chunks else np.zeros(0)
+    header = {
+        "rows": rows,
+        "cols": cols,
+        "row_field": table.get("row_field"),
+        "col_field": table.get("col_field"),
+        "highlight_tiers": ["none"] + list(HIGHLIGHT_TIERS),
+    }
+    arrays["header"] = np.array(json.dumps(header, default=str))
+    # A file handle keeps numpy from appending ".npz" to the path.
+    with open(path, "wb") as handle:
+        np.savez(handle, **arrays)
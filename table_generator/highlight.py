@@ -0,0 +1,116 @@
+"""Top-k highlight selection.
+
+Each ranking group (a column, a row or the whole table) is a list of cell
+keys with their centers, sign-adjusted so larger is better. Selection finds
+the k best distinct values in one pass, then collects their cells in a
+second pass, so ranking is O(cells * k) rather than a full sort per group.
+Large tables are ranked with NumPy over a padded group-by-item matrix.
+
+Tie modes, applied at every tier in turn:
+- ``all``: every cell at the tier's value gets the tier; a tie ends ranking
+  (two tied best cells leave no second).
+- ``first``: only the first tied cell (in group order) gets the tier.
+- ``none``: a tie at a tier ends ranking without highlighting that tier.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .schema import HIGHLIGHT_TIERS
+from .stats import np
+
+# Below this many ranked cells the pure-Python path is faster.
+_VECTOR_MIN_CELLS = 4096
+
+Group = Tuple[List[Any], List[float]]
+
+
+def highlight_depth(highlight: Dict[str, Any]) -> int:
+    """Number of tiers to rank: at least best and second, more if deeper tiers are configured."""
+    depth = 2
+    for idx, tier in enumerate(HIGHLIGHT_TIERS):
+        if tier in highlight:
+            depth = max(depth, idx + 1)
+    return depth
+
+
+def rank_groups(groups: Sequence[Group], k: int, ties: str) -> Dict[Any, str]:
+    """Return ``{key: tier name}`` for the top ``k`` tiers of every group."""
+    total = sum(len(values) for _, values in groups)
+    if np is not None and total >= _VECTOR_MIN_CELLS:
+        return _rank_groups_numpy(groups, k, ties)
+    highlights: Dict[Any, str] = {}
+    for keys, values in groups:
+        _rank_group(keys, values, k, ties, highlights)
+    return highlights
+
+
+def _rank_group(keys: List[Any], values: List[float], k: int, ties: str, out: Dict[Any, str]) -> None:
+    # Top-k distinct values, best first. NaN never ranks.
+    levels: List[float] = []
+    for value in values:
+        if value != value:
+            continue
+        if len(levels) == k and value <= levels[-1]:
+            continue
+        if value in levels:
+            continue
+        levels.append(value)
+        levels.sort(reverse=True)
+        del levels[k:]
+    if not levels:
+        return
+    members: Dict[float, List[Any]] = {level: [] for level in levels}
+    for key, value in zip(keys, values):
+        bucket = members.get(value)
+        if bucket is not None:
+            bucket.append(key)
+    for tier, level in enumerate(levels):
+        group = members[level]
+        if ties == "first":
+            group = group[:1]
+        if ties == "none" and len(group) > 1:
+            return
+        for key in group:
+            out[key] = HIGHLIGHT_TIERS[tier]
+        if ties == "all" and len(group) > 1:
+            return
+
+
+def _rank_groups_numpy(groups: Sequence[Group], k: int, ties: str) -> Dict[Any, str]:
+    width = max(len(values) for _, values in groups)
+    work = np.full((len(groups), width), np.nan)
+    for g, (_, values) in enumerate(groups):
+        work[g, : len(values)] = values
+    tiers = np.zeros(work.shape, dtype=np.int8)
+    active = np.ones(len(groups), dtype=bool)
+    rows = np.arange(len(groups))
+    for tier in range(1, k + 1):
+        valid = ~np.isnan(work)
+        active &= valid.any(axis=1)
+        if not active.any():
+            break
+        level = np.where(valid, work, -np.inf).max(axis=1)
+        at_level = valid & (work == level[:, None])
+        hits = at_level & active[:, None]
+        count = hits.sum(axis=1)
+        if ties == "first":
+            first = hits.argmax(axis=1)
+            hits = np.zeros_like(hits)
+            has = count > 0
+            hits[rows[has], first[has]] = True
+        elif ties == "none":
+            tied = count > 1
+            hits[tied] = False
+            active &= ~tied
+        tiers[hits] = tier
+        if ties == "all":
+            active &= count <= 1
+        # The next tier is the next distinct value.
+        work[at_level] = np.nan
+
+    highlights: Dict[Any, str] = {}
+    for g, idx in zip(*np.nonzero(tiers)):
+        highlights[groups[g][0][idx]] = HIGHLIGHT_TIERS[tiers[g, idx] - 1]
+    return highlights
@@ -0,0 +1,117 @@
+"""Incrementally updated tables for results that are still coming in."""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .cache import BootstrapCache
+from .index import CellGrouper
+from .pipeline import (
+    _build_cells,
+    _compute_highlights,
+    _finish_table,
+    _grouping_options,
+    compute_significance,
+    render_result,
+)
+from .schema import validate_spec
+
+
+class IncrementalTable:
+    """A table that absorbs appended records and updates only what they touch.
+
+    Each ``append`` regroups the new records into their cells, then rebuilds
+    stats and bootstrap CIs for the touched cells only. Deltas and summaries
+    are refreshed for the touched rows and columns. Column- or row-scope
+    highlights and significance markers are refreshed for the touched
+    columns (rows). The result always equals a ``build_table`` over all
+    records appended so far.
+
+    Some updates still touch the whole table:
+    - table-scope highlighting re-ranks every cell;
+    - when rows or columns that already existed change relative order (for
+      example under ``rows.order_by``), order-dependent stages are recomputed
+      in full.
+
+    ``aggregate.engine`` and ``aggregate.low_memory`` are ignored; records are
+    always grouped one by one and cells keep their raw values.
+    """
+
+    def __init__(
+        self,
+        spec: Dict[str, Any],
+        records: Iterable[Dict[str, Any]] = (),
+        cache: BootstrapCache | None = None,
+        jobs: int = 1,
+    ) -> None:
+        self.spec = validate_spec(spec)
+        # Untouched cells keep feeding later significance updates.
+        self.spec["aggregate"]["low_memory"] = False
+        self.cache = cache
+        self.jobs = jobs
+        keep_values, keep_over_keys, sketch_error = _grouping_options(self.spec)
+        self._grouper = CellGrouper(self.spec, keep_values, keep_over_keys, sketch_error)
+        self._cells: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        self._table_spec = self.spec
+        self.table: Dict[str, Any] = {
+            "rows": [],
+            "cols": [],
+            "cells": self._cells,
+            "row_field": self.spec["rows"]["field"],
+            "col_field": self.spec["cols"]["field"],
+            "delta_cols": [],
+            "delta_map": {},
+        }
+        self.highlights: Dict[Tuple[Any, Any], str] = {}
+        self.markers: Dict[Tuple[Any, Any], str] = {}
+        self.append(records)
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> List[Tuple[Any, Any]]:
+        """Add records and return the (row, col) keys of the stat cells they changed."""
+        touched: Dict[Tuple[Any, Any], None] = {}
+        self._grouper.add(records, touched)
+        if not touched:
+            return []
+        grouper = self._grouper
+        _build_cells(
+            self._cells, grouper.grouped, grouper.over_keys, list(touched), self.spec, self.cache, self.jobs
+        )
+
+        prev_rows, prev_cols = self.table["rows"], self.table["cols"]
+        # Delta columns rewrite spec.cols.groups, so every rebuild starts from a fresh copy.
+        spec = copy.deepcopy(self.spec)
+        row_seen, col_seen = list(grouper.row_seen), list(grouper.col_seen)
+        table = _finish_table(row_seen, col_seen, self._cells, spec, touched)
+        reordered = _reordered(prev_rows, table["rows"]) or _reordered(prev_cols, table["cols"])
+        if reordered:
+            table = _finish_table(row_seen, col_seen, self._cells, spec)
+        self.table = table
+        self._table_spec = spec
+
+        scope = (spec.get("highlight") or {}).get("scope", "column")
+        if reordered or scope == "table":
+            self.highlights = _compute_highlights(table, spec)
+        else:
+            axis = 1 if scope == "column" else 0
+            changed = {key[axis] for key in touched}
+            self.highlights = {k: v for k, v in self.highlights.items() if k[axis] not in changed}
+            self.highlights.update(_compute_highlights(table, spec, changed))
+
+        if reordered:
+            self.markers = compute_significance(table, spec, self.cache, self.jobs)
+        else:
+            changed_cols = {c for _, c in touched}
+            self.markers = {k: v for k, v in self.markers.items() if k[1] not in changed_cols}
+            self.markers.update(compute_significance(table, spec, self.cache, self.jobs, changed_cols))
+        return list(touched)
+
+    def render(self) -> Dict[str, Any]:
+        """Render the current table (same result shape as ``render_table``)."""
+        return render_result(self.table, self.highlights, self.markers, self._table_spec)
+
+
+def _reordered(previous: List[Any], current: List[Any]) -> bool:
+    """True when items of ``previous`` no longer appear in the same relative order."""
+    kept = set(previous)
+    return [item for item in current if item in kept] != list(previous)
@@ -0,0 +1,171 @@
+"""Record index shared by several table specs.
+
+``RecordIndex`` buckets records by metric value in a single pass per metric
+field, so each spec only touches the records it selects. Cell grouping is
+memoized on the parts of a spec that determine it, so specs that differ
+only in formatting, highlighting, deltas or significance share one grouping
+pass.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .columnar import columns_from_records, group_columns
+from .stats import RunningStats
+
+Grouping = Tuple[List[Any], List[Any], Dict[Tuple[Any, Any], Any], Dict[Tuple[Any, Any], List[Tuple[Any, ...]]]]
+
+
+class RecordIndex:
+    """Records bucketed by ``metric.field`` value, with memoized cell grouping."""
+
+    def __init__(self, records: Iterable[Dict[str, Any]]) -> None:
+        self.records = records if isinstance(records, list) else list(records)
+        self._by_metric: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {}
+        self._groupings: Dict[str, Grouping] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def select(self, spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Records whose ``metric.field`` equals ``metric.value``."""
+        field = spec["metric"]["field"]
+        buckets = self._by_metric.get(field)
+        if buckets is None:
+            buckets = self._by_metric[field] = {}
+            for rec in self.records:
+                if field not in rec:
+                    raise ValueError(f"Missing metric field '{field}' in record")
+                buckets.setdefault(rec[field], []).append(rec)
+        return buckets.get(spec["metric"]["value"], [])
+
+    def group(
+        self,
+        spec: Dict[str, Any],
+        keep_values: bool,
+        keep_over_keys: bool,
+        sketch_error: float | None,
+    ) -> Grouping:
+        """Group the records ``spec`` selects into cells, reusing earlier identical groupings."""
+        agg = spec["aggregate"]
+        engine = agg.get("engine", "records")
+        key = json.dumps(
+            [
+                spec["metric"]["field"],
+                spec["metric"]["value"],
+                spec["rows"]["field"],
+                spec["rows"].get("rename"),
+                spec["cols"]["field"],
+                spec["cols"].get("rename"),
+                agg["over"],
+                engine,
+                keep_values,
+                keep_over_keys,
+                sketch_error,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        grouping = self._groupings.get(key)
+        if grouping is None:
+            selected = self.select(spec)
+            if engine == "columnar":
+                grouping = group_columns(
+                    columns_from_records(selected, spec), spec, keep_values, keep_over_keys, sketch_error
+                )
+            else:
+                grouping = group_records(selected, spec, keep_values, keep_over_keys, sketch_error)
+            self._groupings[key] = grouping
+        return grouping
+
+
+class CellGrouper:
+    """Record-engine grouping state that can keep absorbing records.
+
+    Rows and cols keep first-seen order; each cell holds either a raw value
+    list (``keep_values``) or a ``RunningStats`` accumulator.
+    """
+
+    def __init__(
+        self,
+        spec: Dict[str, Any],
+        keep_values: bool,
+        keep_over_keys: bool,
+        sketch_error: float | None,
+    ) -> None:
+        self.spec = spec
+        self.keep_values = keep_values
+        self.keep_over_keys = keep_over_keys
+        self.sketch_error = sketch_error
+        self.row_seen: Dict[Any, None] = {}
+        self.col_seen: Dict[Any, None] = {}
+        self.grouped: Dict[Tuple[Any, Any], Any] = {}
+        self.over_keys: Dict[Tuple[Any, Any], List[Tuple[Any, ...]]] = {}
+
+    def add(
+        self,
+        records: Iterable[Dict[str, Any]],
+        touched: Dict[Tuple[Any, Any], None] | None = None,
+    ) -> None:
+        """Group ``records`` into the cells, noting each updated cell key in ``touched``."""
+        spec = self.spec
+        row_field = spec["rows"]["field"]
+        col_field = spec["cols"]["field"]
+        metric_field = spec["metric"]["field"]
+        metric_value = spec["metric"]["value"]
+        row_rename = spec["rows"].get("rename") or {}
+        col_rename = spec["cols"].get("rename") or {}
+        over_fields = spec["aggregate"]["over"]
+        keep_values = self.keep_values
+        keep_over_keys = self.keep_over_keys
+        row_seen = self.row_seen
+        col_seen = self.col_seen
+        grouped = self.grouped
+        over_keys = self.over_keys
+        for rec in records:
+            if metric_field not in rec:
+                raise ValueError(f"Missing metric field '{metric_field}' in record")
+            if rec[metric_field] != metric_value:
+                continue
+            if row_field not in rec or col_field not in rec:
+                raise ValueError("Record missing row/col field")
+            if "value" not in rec:
+                raise ValueError("Record missing 'value'")
+            row = row_rename.get(rec[row_field], rec[row_field])
+            col = col_rename.get(rec[col_field], rec[col_field])
+            row_seen.setdefault(row)
+            col_seen.setdefault(col)
+            key = (row, col)
+            value = float(rec["value"])
+            if keep_values:
+                grouped.setdefault(key, []).append(value)
+                if keep_over_keys:
+                    over_keys.setdefault(key, []).append(tuple(rec.get(f) for f in over_fields))
+            else:
+                acc = grouped.get(key)
+                if acc is None:
+                    acc = grouped[key] = RunningStats(self.sketch_error)
+                acc.push(value)
+            if touched is not None:
+                touched.setdefault(key)
+
+    def result(self) -> Grouping:
+        return list(self.row_seen), list(self.col_seen), self.grouped, self.over_keys
+
+
+def group_records(
+    records: Iterable[Dict[str, Any]],
+    spec: Dict[str, Any],
+    keep_values: bool,
+    keep_over_keys: bool,
+    sketch_error: float | None,
+) -> Grouping:
+    """Group dict records into cells in one pass (the ``"records"`` engine)."""
+    grouper = CellGrouper(spec, keep_values, keep_over_keys, sketch_error)
+    grouper.add(records)
+    return grouper.result()
@@ -0,0 +1,599 @@
+"""Record loaders that filter and project while reading."""
+
+from __future__ import annotations
+
+import bz2
+import csv
+import glob
+import gzip
+import io
+import json
+import lzma
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from .columnar import RecordColumns, concat_columns, spec_fields
+from .parallel import resolve_jobs
+from .schema import VALID_INPUT_FORMATS
+
+
+# Compressed record files are decompressed while they are read. The codec is
+# picked from the file's magic bytes, so a misnamed file still opens.
+_COMPRESSED_SUFFIXES = (".gz", ".xz", ".bz2")
+_BZ2_BLOCK_MAGICS = (b"1AY&SY", b"\x17rE8P\x90")  # first block, or end of an empty stream
+
+
+def _codec(head: bytes) -> Any:
+    if head.startswith(b"\x1f\x8b"):
+        return gzip.open
+    if head.startswith(b"\xfd7zXZ\x00"):
+        return lzma.open
+    if head[:3] == b"BZh" and head[3:4].isdigit() and head[4:10] in _BZ2_BLOCK_MAGICS:
+        return bz2.open
+    return None
+
+
+def open_records(path: str, text: bool = False) -> Any:
+    """Open a records file for streaming reads, decompressing gzip, xz or bz2 on the fly.
+
+    Returns a binary file object, or a UTF-8 text one with ``text=True``.
+    """
+    with open(path, "rb") as probe:
+        head = probe.read(10)
+    opener = _codec(head)
+    if opener is None:
+        if text:
+            return open(path, "r", encoding="utf-8", newline="")
+        return open(path, "rb")
+    handle = opener(path, "rb")
+    return io.TextIOWrapper(handle, encoding="utf-8", newline="") if text else handle
+
+
+def records_suffix(path: str) -> str:
+    """The records file extension, ignoring a compression suffix (``a.jsonl.gz`` -> ``.jsonl``)."""
+    root, ext = os.path.splitext(path)
+    if ext in _COMPRESSED_SUFFIXES:
+        root, ext = os.path.splitext(root)
+    return ext
+
+
+def record_fields(spec: Dict[str, Any]) -> List[str]:
+    """Every record key a spec reads: metric, row, col, ``aggregate.over`` and ``value``."""
+    fields = [spec["metric"]["field"]]
+    for field in spec_fields(spec) + ["value"]:
+        if field not in fields:
+            fields.append(field)
+    return fields
+
+
+def _metric_needle(value: Any) -> Optional[bytes]:
+    """Bytes every JSON line with this metric value must contain, or None if no safe check exists."""
+    if not isinstance(value, str):
+        # Numbers have several spellings (1, 1.0, 1e0); parse every line.
+        return None
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def iter_jsonl_records(path: str, spec: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield records from a JSONL file.
+
+    With a validated ``spec``, lines that cannot match ``spec.metric`` are
+    skipped by a byte-level substring check before parsing, parsed records
+    whose metric differs are dropped, and the rest keep only the fields the
+    spec reads.
+    """
+    if spec is None:
+        with open_records(path) as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        return
+    yield from iter_jsonl_records_for(path, [spec])
+
+
+def _selection(specs: Sequence[Dict[str, Any]]) -> Tuple[Dict[str, set], List[str]]:
+    """Metric values each metric field may take, and the union of fields the specs read."""
+    wanted: Dict[str, set] = {}
+    fields: List[str] = []
+    for spec in specs:
+        wanted.setdefault(spec["metric"]["field"], set()).add(_hashable(spec["metric"]["value"]))
+        for field in record_fields(spec):
+            if field not in fields:
+                fields.append(field)
+    return wanted, fields
+
+
+def _select(rec: Dict[str, Any], wanted: Dict[str, set], fields: List[str]) -> Optional[Dict[str, Any]]:
+    keep = False
+    for metric_field, values in wanted.items():
+        if metric_field not in rec:
+            raise ValueError(f"Missing metric field '{metric_field}' in record")
+        if _hashable(rec[metric_field]) in values:
+            keep = True
+    if not keep:
+        return None
+    return {field: rec[field] for field in fields if field in rec}
+
+
+def select_records(
+    records: Iterable[Dict[str, Any]], specs: Sequence[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """Yield the records any of ``specs`` selects, projected onto the fields they read."""
+    wanted, fields = _selection(specs)
+    for rec in records:
+        kept = _select(rec, wanted, fields)
+        if kept is not None:
+            yield kept
+
+
+def iter_jsonl_records_for(path: str, specs: Sequence[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Like ``iter_jsonl_records`` but keeps records any of ``specs`` selects.
+
+    Kept records carry the union of the fields the specs read.
+    """
+    wanted, fields = _selection(specs)
+    needles: Optional[List[bytes]] = []
+    for values in wanted.values():
+        for value in values:
+            needle = _metric_needle(value)
+            if needle is None:
+                needles = None
+                break
+            needles.append(needle)
+        if needles is None:
+            break
+    with open_records(path) as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            # Escaped lines may spell the metric differently; always parse them.
+            if needles is not None and b"\\" not in line and not any(needle in line for needle in needles):
+                continue
+            kept = _select(json.loads(line), wanted, fields)
+            if kept is not None:
+                yield kept
+
+
+def input_format(specs: Sequence[Dict[str, Any]], override: Optional[str] = None) -> str:
+    """The records input format: ``override`` if given, else the specs' shared ``input.format``."""
+    if override is not None:
+        if override not in VALID_INPUT_FORMATS:
+            raise ValueError(f"Unknown input format '{override}'")
+        return override
+    formats = {(spec.get("input") or {}).get("format", "records") for spec in specs}
+    if len(formats) > 1:
+        raise ValueError("Specs disagree on input.format; pass the input format explicitly")
+    return formats.pop() if formats else "records"
+
+
+def iter_records(
+    path: str, specs: Sequence[Dict[str, Any]] = (), fmt: str = "records"
+) -> Iterator[Dict[str, Any]]:
+    """Yield records from ``path``, keeping only those (and the fields) ``specs`` read.
+
+    ``fmt`` is ``"records"`` (a JSON list; JSONL, CSV or TSV by extension) or
+    ``"nested"`` (see ``iter_nested_records``). Without ``specs`` every record
+    is yielded whole.
+    """
+    if fmt == "nested":
+        metrics = None
+        if specs and all(spec["metric"]["field"] == "metric" for spec in specs):
+            metrics = [spec["metric"]["value"] for spec in specs]
+        records = iter_nested_records(path, metrics)
+    elif is_delimited(path):
+        return iter_delimited_records(path, specs)
+    elif records_suffix(path) == ".jsonl":
+        if specs:
+            return iter_jsonl_records_for(path, specs)
+        return iter_jsonl_records(path)
+    else:
+        with open_records(path) as handle:
+            records = json.load(handle)
+        if not isinstance(records, list):
+            raise ValueError("Records JSON must be a list")
+    return select_records(records, specs) if specs else iter(records)
+
+
+def expand_record_paths(values: Sequence[str]) -> List[str]:
+    """Expand glob patterns (sorted) and drop repeats, keeping the given order."""
+    paths: Dict[str, None] = {}
+    for value in values:
+        if glob.has_magic(value):
+            matches = sorted(glob.glob(value))
+            if not matches:
+                raise ValueError(f"No records files match '{value}'")
+            paths.update(dict.fromkeys(matches))
+        else:
+            paths.setdefault(value)
+    return list(paths)
+
+
+def load_shards(
+    paths: Sequence[str], specs: Sequence[Dict[str, Any]], fmt: str = "records", jobs: int = 1
+) -> RecordColumns:
+    """Load several records files into one ``RecordColumns``, in path order.
+
+    Each file is parsed by a worker process (``jobs`` of them; ``0`` uses every
+    core) that applies the specs' metric filter and field projection and
+    returns compact columns: interned labels plus code and value arrays.
+    """
+    tasks = [(path, list(specs), fmt) for path in paths]
+    workers = min(resolve_jobs(jobs), len(tasks))
+    if workers <= 1:
+        return concat_columns(map(_shard_columns, tasks))
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return concat_columns(pool.map(_shard_columns, tasks, chunksize=chunksize))
+
+
+def _shard_columns(task: Tuple[str, List[Dict[str, Any]], str]) -> RecordColumns:
+    path, specs, fmt = task
+    fields: List[str] = []
+    for spec in specs:
+        for field in record_fields(spec):
+            if field != "value" and field not in fields:
+                fields.append(field)
+    axes = [
+        (spec["metric"]["field"], spec["metric"]["value"], spec["rows"]["field"], spec["cols"]["field"])
+        for spec in specs
+    ]
+    columns = RecordColumns(fields)
+    for rec in iter_records(path, specs, fmt):
+        for metric_field, metric_value, row_field, col_field in axes:
+            if rec[metric_field] == metric_value and (row_field not in rec or col_field not in rec):
+                raise ValueError("Record missing row/col field")
+        if "value" not in rec:
+            raise ValueError("Record missing 'value'")
+        columns.append(rec)
+    return columns
+
+
+# CSV/TSV: one record per row, keyed by the header. Every cell is text, so
+# labels stay strings and ``value`` is parsed as a float.
+
+_DELIMITERS = {".csv": ",", ".tsv": "\t"}
+# Rows parsed and transposed per batch when building columns.
+_CSV_BATCH = 1 << 14
+
+
+def is_delimited(path: str) -> bool:
+    """True for ``.csv`` and ``.tsv`` paths (possibly compressed)."""
+    return records_suffix(path) in _DELIMITERS
+
+
+def _csv_text(value: Any) -> str:
+    """How a metric value is spelled in a CSV cell."""
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def _open_delimited(
+    path: str, metric_texts: Optional[Iterable[str]] = None
+) -> Tuple[TextIO, Any, Dict[str, int]]:
+    """Open ``path``; return (handle, row reader, header index).
+
+    With ``metric_texts``, lines that contain none of them are skipped before
+    CSV parsing (the metric cell's text appears verbatim unless it needs quoting).
+    """
+    delimiter = _DELIMITERS[records_suffix(path)]
+    handle = open_records(path, text=True)
+    header = next(csv.reader(handle, delimiter=delimiter), None)
+    if header is None:
+        handle.close()
+        raise ValueError(f"Records file '{path}' has no header row")
+    lines: Iterable[str] = handle
+    if metric_texts is not None:
+        needles = list(metric_texts)
+        if all(needle and '"' not in needle and delimiter not in needle for needle in needles):
+            lines = _lines_with(handle, needles)
+    return handle, csv.reader(lines, delimiter=delimiter), {name: idx for idx, name in enumerate(header)}
+
+
+def _lines_with(handle: TextIO, needles: List[str]) -> Iterator[str]:
+    search = re.compile("|".join(map(re.escape, needles))).search
+    quoted = False
+    while True:
+        block = handle.read(1 << 20)
+        if not block:
+            return
+        block += handle.readline()
+        if not quoted and '"' not in block:
+            # No quoted fields: every line is one row, filtered at C speed.
+            yield from filter(search, block.split("\n"))
+            continue
+        # Lines inside a multi-line quoted field (odd quote count so far) always pass.
+        for line in block.splitlines(keepends=True):
+            has_quote = '"' in line
+            if quoted or has_quote or search(line):
+                yield line
+                if has_quote:
+                    quoted ^= line.count('"') % 2 == 1
+
+
+def _column_index(header: Dict[str, int], field: str, path: str) -> int:
+    if field not in header:
+        raise ValueError(f"Records file '{path}' has no '{field}' column")
+    return header[field]
+
+
+def _float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f"Non-numeric value {text!r} in 'value' column") from None
+
+
+def read_delimited_columns(path: str, spec: Dict[str, Any]) -> RecordColumns:
+    """Read a CSV/TSV file straight into ``RecordColumns`` for one validated spec.
+
+    Only the metric, row, column, ``aggregate.over`` and ``value`` columns are
+    read (``aggregate.over`` columns may be absent); rows whose metric differs
+    are dropped before any conversion. The
+    picked cells are transposed in batches, so no per-row dict is built.
+    """
+    metric_field = spec["metric"]["field"]
+    metric_text = _csv_text(spec["metric"]["value"])
+    handle, reader, header = _open_delimited(path, [metric_text])
+    with handle:
+        # A missing aggregate.over column reads as None, as for records
+        # without that field; row and col columns are required.
+        over = spec["aggregate"]["over"]
+        fields = [field for field in spec_fields(spec) if field in header or field not in over]
+        columns = RecordColumns(fields, filters={metric_field: spec["metric"]["value"]})
+        metric_idx = _column_index(header, metric_field, path)
+        picked = [_column_index(header, field, path) for field in fields]
+        picked.append(_column_index(header, "value", path))
+        pick = itemgetter(*picked)
+        # Full rows are dropped as soon as their columns are picked.
+        selected = (pick(row) for row in reader if row and row[metric_idx] == metric_text)
+        targets = [columns.labels[field] for field in fields]
+        while True:
+            try:
+                rows = list(islice(selected, _CSV_BATCH))
+            except IndexError:
+                raise ValueError(f"Records file '{path}' has a row with too few columns") from None
+            if not rows:
+                break
+            transposed = list(zip(*rows))
+            for column, labels in zip(targets, transposed):
+                # Intern each distinct label once, then map codes at C speed.
+                codes = {label: column.intern(label) for label in set(labels)}
+                column.codes.extend(map(codes.__getitem__, labels))
+            try:
+                columns.values.extend(map(float, transposed[-1]))
+            except ValueError:
+                list(map(_float, transposed[-1]))  # raises with the offending text
+    return columns
+
+
+def iter_delimited_records(path: str, specs: Sequence[Dict[str, Any]] = ()) -> Iterator[Dict[str, Any]]:
+    """Yield CSV/TSV rows as records, with ``value`` parsed as a float.
+
+    With ``specs``, only rows some spec selects are yielded, projected onto
+    the columns the specs read.
+    """
+    wanted, fields = _selection(specs)
+    texts = {field: {_csv_text(value) for value in values} for field, values in wanted.items()}
+    handle, reader, header = _open_delimited(path, set().union(*texts.values()) if specs else None)
+    with handle:
+        if specs:
+            metric_cols = {}
+            for field, field_texts in texts.items():
+                metric_cols[_column_index(header, field, path)] = field_texts
+            columns = [(field, header[field]) for field in fields if field in header]
+        else:
+            metric_cols = {}
+            columns = list(header.items())
+        width = max([idx for _, idx in columns] + list(metric_cols)) + 1
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                raise ValueError(f"Records file '{path}' has a row with too few columns")
+            if metric_cols and not any(row[idx] in allowed for idx, allowed in metric_cols.items()):
+                continue
+            rec = {field: row[idx] for field, idx in columns}
+            if "value" in rec:
+                rec["value"] = _float(rec["value"])
+            yield rec
+
+
+def _hashable(value: Any) -> Any:
+    return json.dumps(value, sort_keys=True) if isinstance(value, (dict, list)) else value
+
+
+# Nested per-method results files (see example/results.json):
+#   {"dataset": ..., "methods": {"<method>": {"metrics": [...], "samples": [{...}, ...]}}}
+# are flattened into long-form records while the file is read.
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _JsonStream:
+    """Pull parser over a JSON text file.
+
+    Objects and arrays are walked token by token; only leaf values (and
+    each sample object) are decoded, with ``json.JSONDecoder.raw_decode``.
+    The buffer holds at most one chunk plus the value being decoded.
+    """
+
+    def __init__(self, handle: TextIO, chunk_size: int = 1 << 16) -> None:
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        # Read at least as much as is buffered so a long value costs O(n) retries.
+        chunk = self.handle.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or ``""`` at end of input."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Malformed nested results file: expected '{char}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as exc:
+                if self._fill():
+                    continue
+                raise ValueError(f"Malformed nested results file: {exc.msg}") from None
+            # A number that ends at the buffer edge may continue in the next chunk.
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _items(self, open_char: str, close_char: str) -> Iterator[None]:
+        self.expect(open_char)
+        if self.peek() == close_char:
+            self.pos += 1
+            return
+        while True:
+            yield None
+            char = self.peek()
+            self.pos += 1
+            if char == close_char:
+                return
+            if char != ",":
+                raise ValueError(f"Malformed nested results file: expected ',' or '{close_char}'")
+
+    def keys(self) -> Iterator[str]:
+        """Walk an object; the caller reads each member's value before the next key."""
+        for _ in self._items("{", "}"):
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Malformed nested results file: expected an object key")
+            self.expect(":")
+            yield key
+
+    def elements(self) -> Iterator[None]:
+        """Walk an array; the caller reads each element before the next step."""
+        return self._items("[", "]")
+
+
+def iter_nested_records(path: str, metrics: Optional[Iterable[Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield long-form records from a nested per-method results file.
+
+    Each sample of each method becomes one record per metric:
+    ``{<top-level scalars>, "method", <sample fields>, "metric", "value"}``.
+    A method's metrics are its ``metrics`` list, or else every numeric
+    sample field except ``sample_id``. The file may also hold a list of such
+    documents. With ``metrics``, records for other metrics are not built.
+
+    The file is parsed incrementally and memory holds one sample at a time.
+    Top-level scalars are those that precede ``methods``; only when none do
+    are a document's records buffered, to attach the scalars that follow.
+    """
+    keep = None if metrics is None else {_hashable(metric) for metric in metrics}
+    with open_records(path, text=True) as handle:
+        stream = _JsonStream(handle)
+        if stream.peek() == "[":
+            for _ in stream.elements():
+                yield from _nested_document(stream, keep)
+        else:
+            yield from _nested_document(stream, keep)
+        if stream.peek():
+            raise ValueError("Malformed nested results file: trailing data")
+
+
+def _nested_document(stream: _JsonStream, keep: Optional[set]) -> Iterator[Dict[str, Any]]:
+    if stream.peek() != "{":
+        raise ValueError("Nested results document must be an object")
+    context: Dict[str, Any] = {}
+    seen_methods = False
+    pending: List[Dict[str, Any]] = []
+    for key in stream.keys():
+        if key != "methods":
+            value = stream.value()
+            if not isinstance(value, (dict, list)):
+                context[key] = value
+        elif seen_methods:
+            raise ValueError("Nested results document has 'methods' twice")
+        else:
+            seen_methods = True
+            if context:
+                yield from _nested_methods(stream, dict(context), keep)
+            else:
+                pending.extend(_nested_methods(stream, {}, keep))
+    if not seen_methods:
+        raise ValueError("Nested results document has no 'methods' object")
+    for rec in pending:
+        yield {**context, **rec}
+
+
+def _nested_methods(
+    stream: _JsonStream, context: Dict[str, Any], keep: Optional[set]
+) -> Iterator[Dict[str, Any]]:
+    for method in stream.keys():
+        declared: Optional[List[Any]] = None
+        for key in stream.keys():
+            if key == "metrics":
+                declared = stream.value()
+                if not isinstance(declared, list):
+                    raise ValueError(f"Nested results: 'metrics' of method '{method}' must be a list")
+            elif key == "samples":
+                for _ in stream.elements():
+                    sample = stream.value()
+                    if not isinstance(sample, dict):
+                        raise ValueError(f"Nested results: samples of method '{method}' must be objects")
+                    yield from _sample_records(context, method, sample, declared, keep)
+            else:
+                stream.value()
+
+
+def _sample_records(
+    context: Dict[str, Any],
+    method: str,
+    sample: Dict[str, Any],
+    declared: Optional[List[Any]],
+    keep: Optional[set],
+) -> Iterator[Dict[str, Any]]:
+    if declared is None:
+        names = [
+            key
+            for key, value in sample.items()
+            if key != "sample_id" and isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+    else:
+        names = [name for name in declared if name in sample]
+    metric_names = set(names)
+    base = dict(context)
+    base["method"] = method
+    for key, value in sample.items():
+        if key not in metric_names:
+            base[key] = value
+    for name in names:
+        if keep is not None and name not in keep:
+            continue
+        rec = dict(base)
+        rec["metric"] = name
+        rec["value"] = sample[name]
+        yield rec
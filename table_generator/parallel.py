@@ -0,0 +1,117 @@
+"""Process-pool execution of per-cell bootstrap tasks.
+
+A task is ``(kind, vectors, params)`` where ``kind`` names the bootstrap
+routine, ``vectors`` holds the cell value lists it reads and ``params``
+carries stat, level, n_boot, seed and backend. All vectors are packed once
+into a shared-memory block of doubles; each task sent to a worker carries
+only ``(offset, length)`` spans into that block, so cell values are never
+pickled per task.
+
+Every task is seeded from its own params alone, never from pool state, so
+results are bit-identical for any number of workers.
+"""
+
+from __future__ import annotations
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .stats import (
+    bootstrap_diff_ci_batch,
+    bootstrap_diff_ci_batch_adaptive,
+    bootstrap_percentile,
+    bootstrap_percentile_adaptive,
+    mean,
+    median,
+)
+
+Task = Tuple[str, Sequence[Sequence[float]], Dict[str, Any]]
+
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_data: Any = None
+
+
+def resolve_jobs(jobs: int | None) -> int:
+    """Return the worker count for ``jobs`` (``0`` or ``None`` means all cores)."""
+    if not jobs:
+        return os.cpu_count() or 1
+    if jobs < 0:
+        raise ValueError("jobs must be a non-negative int")
+    return jobs
+
+
+def execute_task(kind: str, vectors: Sequence[Sequence[float]], params: Dict[str, Any]) -> Any:
+    """Run one bootstrap task and return a JSON-friendly result.
+
+    Percentile tasks return ``[lo, hi, n_boot_used]``; diff tasks return
+    ``[[[lo, hi], ...], n_boot_used]``. When ``params["precision"]`` is set the
+    adaptive variants run with ``n_boot`` as the batch size.
+    """
+    stat_fn = mean if params["stat"] == "mean" else median
+    level = params["level"]
+    n_boot = params["n_boot"]
+    seed = params["seed"]
+    backend = params["backend"]
+    precision = params.get("precision")
+    if kind == "bootstrap_percentile":
+        if precision is None:
+            lo, hi = bootstrap_percentile(vectors[0], stat_fn, level, n_boot, seed, backend)
+            return [lo, hi, n_boot]
+        return list(bootstrap_percentile_adaptive(
+            vectors[0], stat_fn, level, n_boot, params["max_boot"], precision, seed, backend
+        ))
+    if kind == "bootstrap_diff_ci_batch":
+        candidates = list(vectors[1:])
+        if precision is None:
+            cis = bootstrap_diff_ci_batch(candidates, vectors[0], stat_fn, level, n_boot, seed, backend)
+            used = n_boot
+        else:
+            cis, used = bootstrap_diff_ci_batch_adaptive(
+                candidates, vectors[0], stat_fn, level, n_boot, params["max_boot"], precision, seed, backend
+            )
+        return [[list(ci) for ci in cis], used]
+    raise ValueError(f"Unknown bootstrap task '{kind}'")
+
+
+def _init_worker(shm_name: str) -> None:
+    global _worker_shm, _worker_data
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_data = _worker_shm.buf.cast("d")
+
+
+def _run_packed(task: Tuple[str, List[Tuple[int, int]], Dict[str, Any]]) -> Any:
+    kind, spans, params = task
+    vectors = [_worker_data[start:start + length].tolist() for start, length in spans]
+    return execute_task(kind, vectors, params)
+
+
+def run_tasks(tasks: List[Task], jobs: int = 1) -> List[Any]:
+    """Run bootstrap tasks, fanning out across ``jobs`` worker processes."""
+    workers = min(resolve_jobs(jobs), len(tasks))
+    if workers <= 1:
+        return [execute_task(kind, vectors, params) for kind, vectors, params in tasks]
+
+    packed = []
+    flat = array("d")
+    for kind, vectors, params in tasks:
+        spans = []
+        for vector in vectors:
+            spans.append((len(flat), len(vector)))
+            flat.extend(vector)
+        packed.append((kind, spans, params))
+
+    payload = memoryview(flat).cast("B")
+    shm = shared_memory.SharedMemory(create=True, size=max(8, len(payload)))
+    try:
+        shm.buf[: len(payload)] = payload
+        chunksize = max(1, len(packed) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(shm.name,)
+        ) as pool:
+            return list(pool.map(_run_packed, packed, chunksize=chunksize))
+    finally:
+        shm.close()
+        shm.unlink()
@@ -4,29 +4,64 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Tuple
 
+from .cache import BootstrapCache
+from .cell import Cell
+from .columnar import RecordColumns, columns_from_records, group_columns
+from .highlight import highlight_depth, rank_groups
+from .index import RecordIndex, group_records
+from .parallel import run_tasks
+from .render_html import render_html
 from .render_latex import render_latex
 from .render_markdown import render_markdown
-from .stats import bootstrap_diff_ci, bootstrap_percentile, mean, median, sem, std
-
-
-def build_table(records: List[Dict[str, Any]], spec: Dict[str, Any]) -> Dict[str, Any]:
-    return _aggregate(records, spec)
+from .sqlite_records import SqliteRecords
+from .stats import (
+    RunningStats,
+    mean,
+    median,
+    median_order_interval,
+    paired_diff_interval,
+    resolve_backend,
+    sem,
+    sketch_median,
+    std,
+    t_interval_from_summary,
+    welch_diff_interval,
+)
+
+
+def build_table(
+    records: List[Dict[str, Any]],
+    spec: Dict[str, Any],
+    cache: BootstrapCache | None = None,
+    jobs: int = 1,
+) -> Dict[str, Any]:
+    return _aggregate(records, spec, cache, jobs)
 
 
 def compute_highlights(table: Dict[str, Any], spec: Dict[str, Any]) -> Dict[Tuple[Any, Any], str]:
     return _compute_highlights(table, spec)
 
 
-def render_pipeline(records: List[Dict[str, Any]], spec: Dict[str, Any]) -> Dict[str, Any]:
-    table = build_table(records, spec)
+def render_pipeline(
+    records: List[Dict[str, Any]],
+    spec: Dict[str, Any],
+    cache: BootstrapCache | None = None,
+    jobs: int = 1,
+) -> Dict[str, Any]:
+    table = build_table(records, spec, cache, jobs)
     highlights = compute_highlights(table, spec)
-    markers = compute_significance(table, spec)
-    if spec["output"]["format"] == "latex":
-        text, preamble = render_latex(table, highlights, spec, markers)
-    else:
-        text = render_markdown(table, highlights, spec, markers)
-        preamble = []
-
+    markers = compute_significance(table, spec, cache, jobs)
+    return render_result(table, highlights, markers, spec)
+
+
+def render_result(
+    table: Dict[str, Any],
+    highlights: Dict[Tuple[Any, Any], str],
+    markers: Dict[Tuple[Any, Any], str],
+    spec: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Render a computed table into the ``render_table`` result dict."""
+    text, preamble = render_text(table, highlights, markers, spec, spec["output"]["format"])
     return {
         "format": spec["output"]["format"],
         "text": text,
@@ -40,10 +75,21 @@ def render_pipeline(records: List[Dict[str, Any]], spec: Dict[str, Any]) -> Dict
     }
 
 
-def _apply_rename(value: Any, rename_map: Dict[str, str]) -> Any:
-    if rename_map is None:
-        return value
-    return rename_map.get(value, value)
+def render_text(
+    table: Dict[str, Any],
+    highlights: Dict[Tuple[Any, Any], str],
+    markers: Dict[Tuple[Any, Any], str],
+    spec: Dict[str, Any],
+    fmt: str,
+) -> Tuple[str, List[str]]:
+    """Render a computed table as ``"latex"``, ``"markdown"`` or ``"html"``; returns (text, preamble)."""
+    if fmt == "latex":
+        return render_latex(table, highlights, spec, markers)
+    if fmt == "markdown":
+        return render_markdown(table, highlights, spec, markers), []
+    if fmt == "html":
+        return render_html(table, highlights, spec, markers), []
+    raise ValueError(f"Unsupported output format '{fmt}'")
 
 
 def _ordered_unique(items: List[Any]) -> List[Any]:
@@ -61,95 +107,224 @@ def _resolve_order(values: List[Any], order: List[Any] | None) -> List[Any]:
     values = _ordered_unique(values)
     if not order:
         return values
-    ordered = []
-    remaining = [v for v in values if v not in order]
-    for v in order:
-        if v in values:
-            ordered.append(v)
-    ordered.extend(remaining)
+    present = set(values)
+    requested = set(order)
+    ordered = [v for v in order if v in present]
+    ordered.extend(v for v in values if v not in requested)
     return ordered
 
 
-def _aggregate(records: List[Dict[str, Any]], spec: Dict[str, Any]) -> Dict[str, Any]:
-    rows_spec = spec["rows"]
-    cols_spec = spec["cols"]
-    metric_spec = spec["metric"]
+def _aggregate(
+    records: List[Dict[str, Any]],
+    spec: Dict[str, Any],
+    cache: BootstrapCache | None = None,
+    jobs: int = 1,
+) -> Dict[str, Any]:
     agg_spec = spec["aggregate"]
+    keep_values, keep_over_keys, sketch_error = _grouping_options(spec)
+
+    if isinstance(records, (RecordIndex, SqliteRecords)):
+        row_seen, col_seen, grouped, over_keys = records.group(
+            spec, keep_values, keep_over_keys, sketch_error
+        )
+    elif isinstance(records, RecordColumns) or agg_spec.get("engine", "records") == "columnar":
+        if not isinstance(records, RecordColumns):
+            records = columns_from_records(records, spec)
+        row_seen, col_seen, grouped, over_keys = group_columns(
+            records, spec, keep_values, keep_over_keys, sketch_error
+        )
+    else:
+        row_seen, col_seen, grouped, over_keys = group_records(
+            records, spec, keep_values, keep_over_keys, sketch_error
+        )
 
-    row_field = rows_spec["field"]
-    col_field = cols_spec["field"]
-    metric_field = metric_spec["field"]
-    metric_value = metric_spec["value"]
-
-    row_rename = rows_spec.get("rename", {})
-    col_rename = cols_spec.get("rename", {})
+    cells: Dict[Tuple[Any, Any], Cell] = {}
+    _build_cells(cells, grouped, over_keys, list(grouped), spec, cache, jobs)
+    if agg_spec.get("low_memory") and not spec.get("significance"):
+        _discard_values(cells)
+    return _finish_table(row_seen, col_seen, cells, spec)
 
-    filtered = []
-    for rec in records:
-        if metric_field not in rec:
-            raise ValueError(f"Missing metric field '{metric_field}' in record")
-        if rec[metric_field] != metric_value:
-            continue
-        if row_field not in rec or col_field not in rec:
-            raise ValueError("Record missing row/col field")
-        rec = dict(rec)
-        rec[row_field] = _apply_rename(rec[row_field], row_rename)
-        rec[col_field] = _apply_rename(rec[col_field], col_rename)
-        filtered.append(rec)
 
-    row_values = [rec[row_field] for rec in filtered]
-    col_values = [rec[col_field] for rec in filtered]
+def _discard_values(cells: Dict[Tuple[Any, Any], Cell]) -> None:
+    """Drop raw values (and paired-test keys) once no later stage reads them."""
+    for cell in cells.values():
+        cell.values = None
+        cell.over_keys = None
 
-    rows = _resolve_order(row_values, rows_spec.get("order"))
-    cols = _resolve_order(col_values, cols_spec.get("order"))
 
-    over_fields = agg_spec["over"]
+def _grouping_options(spec: Dict[str, Any]) -> Tuple[bool, bool, float | None]:
+    """Return (keep_values, keep_over_keys, sketch_error) for grouping records under ``spec``."""
+    agg_spec = spec["aggregate"]
     stat = agg_spec.get("stat", "mean")
+    sketch_error = agg_spec.get("sketch_error", 0.001) if stat == "median_approx" else None
+    # Paired tests match observations across cells by their aggregate.over key.
+    keep_over_keys = (spec.get("significance") or {}).get("method") == "paired_t"
+    return _needs_raw_values(spec), keep_over_keys, sketch_error
+
+
+def _build_cells(
+    cells: Dict[Tuple[Any, Any], Dict[str, Any]],
+    grouped: Dict[Tuple[Any, Any], Any],
+    over_keys: Dict[Tuple[Any, Any], List[Tuple[Any, ...]]],
+    keys: List[Tuple[Any, Any]],
+    spec: Dict[str, Any],
+    cache: BootstrapCache | None,
+    jobs: int,
+) -> None:
+    """(Re)build the stat cells for ``keys`` from their grouped values."""
+    agg_spec = spec["aggregate"]
     unc_spec = agg_spec.get("uncertainty", {"type": "none"})
-    unc_type = unc_spec.get("type", "none")
-
-    stat_fn = mean if stat == "mean" else median
-
-    grouped: Dict[Tuple[Any, Any], List[float]] = {}
-    for rec in filtered:
-        key = (rec[row_field], rec[col_field])
-        if "value" not in rec:
-            raise ValueError("Record missing 'value'")
-        grouped.setdefault(key, []).append(float(rec["value"]))
-
-    cells: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
-    for key, values in grouped.items():
-        center = stat_fn(values)
-        cell = {"center": center, "n": len(values), "unc": None, "ci": None, "values": values}
-        if unc_type == "std":
-            cell["unc"] = std(values)
-        elif unc_type == "sem":
-            cell["unc"] = sem(values)
-        elif unc_type == "ci":
-            level = unc_spec.get("level", 0.95)
-            n_boot = unc_spec.get("n_boot", 1000)
-            seed = unc_spec.get("seed", 0)
-            lo, hi = bootstrap_percentile(values, stat_fn, level, n_boot, seed)
-            cell["ci"] = (lo, hi)
-        cells[key] = cell
-
+    # With raw values at hand, "median_approx" is simply the exact median.
+    stat_fn = mean if agg_spec.get("stat", "mean") == "mean" else median
+    keep_values, keep_over_keys, _ = _grouping_options(spec)
+    for key in keys:
+        group = grouped[key]
+        if keep_values:
+            cells[key] = _cell_from_values(group, stat_fn, unc_spec)
+            if keep_over_keys:
+                cells[key]["over_keys"] = over_keys[key]
+        else:
+            cells[key] = _cell_from_running(group, unc_spec)
+    if (
+        unc_spec.get("type", "none") == "ci"
+        and unc_spec.get("method", "bootstrap_percentile") == "bootstrap_percentile"
+    ):
+        _apply_bootstrap_cis({key: cells[key] for key in keys}, stat_fn, unc_spec, cache, jobs)
+
+
+def _finish_table(
+    row_seen: List[Any],
+    col_seen: List[Any],
+    cells: Dict[Tuple[Any, Any], Dict[str, Any]],
+    spec: Dict[str, Any],
+    only: Dict[Tuple[Any, Any], None] | None = None,
+) -> Dict[str, Any]:
+    """Order rows/cols and add delta and summary cells around the stat cells.
+
+    ``only`` limits delta and summary recomputation to the rows and columns
+    of those stat cell keys; other derived cells in ``cells`` are kept.
+    """
+    rows_spec = spec["rows"]
+    cols_spec = spec["cols"]
     table = {
-        "rows": rows,
-        "cols": cols,
+        "rows": _resolve_order(row_seen, rows_spec.get("order")),
+        "cols": _resolve_order(col_seen, cols_spec.get("order")),
         "cells": cells,
-        "row_field": row_field,
-        "col_field": col_field,
+        "row_field": rows_spec["field"],
+        "col_field": cols_spec["field"],
         "delta_cols": [],
         "delta_map": {},
     }
     table["rows"] = _apply_row_order_by(table, spec)
-    _apply_delta_columns(table, spec)
+    _apply_delta_columns(table, spec, only)
     _validate_groups(table["rows"], rows_spec.get("groups"), axis="rows")
     _validate_groups(table["cols"], cols_spec.get("groups"), axis="cols")
-    _apply_summaries(table, spec)
+    _apply_summaries(table, spec, only)
     return table
 
 
+def _needs_raw_values(spec: Dict[str, Any]) -> bool:
+    """Return True when a later stage needs each cell's raw value list."""
+    agg_spec = spec["aggregate"]
+    unc_spec = agg_spec.get("uncertainty", {"type": "none"})
+    # The t interval needs only count, mean and SD.
+    needs_ci_values = (
+        unc_spec.get("type", "none") == "ci"
+        and unc_spec.get("method", "bootstrap_percentile") != "t_interval"
+    )
+    return (
+        bool(agg_spec.get("keep_values"))
+        or agg_spec.get("stat", "mean") == "median"
+        or needs_ci_values
+        or _significance_needs_values(spec)
+    )
+
+
+def _significance_needs_values(spec: Dict[str, Any]) -> bool:
+    sig = spec.get("significance")
+    return bool(sig) and sig.get("method", "bootstrap_ci") != "welch_t"
+
+
+def _bootstrap_params(block: Dict[str, Any], stat: str) -> Dict[str, Any]:
+    """Task params for a bootstrap block (``aggregate.uncertainty`` or ``significance``)."""
+    n_boot = block.get("n_boot", 1000)
+    params = {
+        "stat": stat,
+        "level": block.get("level", 0.95),
+        "n_boot": n_boot,
+        "seed": block.get("seed", 0),
+        "backend": resolve_backend(block.get("backend", "python")),
+    }
+    if block.get("precision") is not None:
+        params["precision"] = block["precision"]
+        params["max_boot"] = block.get("max_boot", 10 * n_boot)
+    return params
+
+
+def _run_bootstrap_tasks(
+    tasks: List[Tuple[str, List[List[float]], Dict[str, Any]]],
+    cache: BootstrapCache | None,
+    jobs: int,
+) -> List[Any]:
+    """Resolve bootstrap tasks from the cache, computing misses across ``jobs`` workers."""
+    if cache is None:
+        return run_tasks(tasks, jobs)
+    return cache.get_or_compute_many(tasks, lambda pending: run_tasks(pending, jobs))
+
+
+def _cell_from_values(values: List[float], stat_fn: Any, unc_spec: Dict[str, Any]) -> Cell:
+    unc_type = unc_spec.get("type", "none")
+    center = stat_fn(values)
+    cell = Cell(center, len(values), values=values)
+    if unc_type == "std":
+        cell["unc"] = std(values)
+    elif unc_type == "sem":
+        cell["unc"] = sem(values)
+    elif unc_type == "ci":
+        method = unc_spec.get("method", "bootstrap_percentile")
+        level = unc_spec.get("level", 0.95)
+        if method == "t_interval":
+            cell["ci"] = t_interval_from_summary(center, std(values), len(values), level)
+        elif method == "order_statistic":
+            cell["ci"] = median_order_interval(values, level)
+    return cell
+
+
+def _apply_bootstrap_cis(
+    cells: Dict[Tuple[Any, Any], Dict[str, Any]],
+    stat_fn: Any,
+    unc_spec: Dict[str, Any],
+    cache: BootstrapCache | None,
+    jobs: int,
+) -> None:
+    # Every cell is seeded with the spec seed on its own, so CIs do not
+    # depend on cell order or on how cells are spread across workers.
+    params = _bootstrap_params(unc_spec, stat_fn.__name__)
+    keys = list(cells)
+    tasks = [("bootstrap_percentile", [cells[key]["values"]], params) for key in keys]
+    for key, (lo, hi, used) in zip(keys, _run_bootstrap_tasks(tasks, cache, jobs)):
+        cells[key]["ci"] = (lo, hi)
+        cells[key]["n_boot"] = used
+
+
+def _cell_from_running(acc: RunningStats, unc_spec: Dict[str, Any]) -> Cell:
+    unc_type = unc_spec.get("type", "none")
+    cell = Cell(
+        acc.mean if acc.sketch is None else acc.sketch.median(),
+        acc.count,
+        mean=acc.mean,
+        sd=acc.std(),
+    )
+    if unc_type == "std":
+        cell["unc"] = acc.std()
+    elif unc_type == "sem":
+        cell["unc"] = acc.sem()
+    elif unc_type == "ci":
+        level = unc_spec.get("level", 0.95)
+        cell["ci"] = t_interval_from_summary(acc.mean, acc.std(), acc.count, level)
+    return cell
+
+
 def _direction_for_column(spec: Dict[str, Any], column: Any, delta_map: Dict[Any, Any] | None = None) -> str:
     direction = spec["metric"]["direction"]
     if isinstance(direction, dict):
@@ -191,12 +366,12 @@ def _validate_groups(items: List[Any], groups: Any, axis: str) -> None:
                 raise ValueError(f"{axis} group member '{member}' appears in multiple groups")
             seen.add(member)
     # Validate members exist in final order
-    missing = [m for m in seen if m not in items]
+    index = {value: idx for idx, value in enumerate(items)}
+    missing = [m for m in seen if m not in index]
     if missing:
         raise ValueError(f"{axis} group members missing from {axis} order: {missing}")
 
     # Ensure each group's members are contiguous in final order
-    index = {value: idx for idx, value in enumerate(items)}
     for group in groups:
         members = [m for m in group.get("members", []) if m in index]
         if not members:
@@ -208,7 +383,16 @@ def _validate_groups(items: List[Any], groups: Any, axis: str) -> None:
             )
 
 
-def _compute_highlights(table: Dict[str, Any], spec: Dict[str, Any]) -> Dict[Tuple[Any, Any], str]:
+def _compute_highlights(
+    table: Dict[str, Any],
+    spec: Dict[str, Any],
+    only: Any = None,
+) -> Dict[Tuple[Any, Any], str]:
+    """Highlight the top tiers (best, second, ...) per column, row or whole table.
+
+    ``only`` limits column (row) scope to that collection of columns (rows);
+    table scope always ranks every cell.
+    """
     highlight = spec.get("highlight")
     if not highlight:
         return {}
@@ -216,97 +400,79 @@ def _compute_highlights(table: Dict[str, Any], spec: Dict[str, Any]) -> Dict[Tup
     scope = highlight.get("scope", "column")
     direction = spec["metric"]["direction"]
     ties = highlight.get("ties", "all")
-
-    def sorted_items(items: List[Tuple[Any, Any, float]], dir_value: str) -> List[Tuple[Any, Any, float]]:
-        reverse = dir_value == "max"
-        return sorted(items, key=lambda x: x[2], reverse=reverse)
+    k = highlight_depth(highlight)
 
     cells = table["cells"]
-    rows = table["rows"]
-    cols = table["cols"]
     summary_rows = set(table.get("summary_rows", []))
-    summary_cols = set(table.get("summary_cols", []))
-    delta_cols = set(table.get("delta_cols", []))
-
-    highlights: Dict[Tuple[Any, Any], str] = {}
-
-    def apply_group(items: List[Tuple[Any, Any, float]], dir_value: str):
-        if not items:
-            return
-        ordered = sorted_items(items, dir_value)
-        best_val = ordered[0][2]
-        best_items = [x for x in ordered if x[2] == best_val]
-        if ties == "first":
-            best_items = best_items[:1]
-        if ties == "none" and len(best_items) > 1:
-            return
-        for r, c, _ in best_items:
-            highlights[(r, c)] = "best"
-
-        if ties == "all" and len(best_items) > 1:
-            return
-
-        second_items = [x for x in ordered if x[2] != best_val]
-        if not second_items:
-            return
-        second_val = second_items[0][2]
-        second_group = [x for x in second_items if x[2] == second_val]
-        if ties == "first":
-            second_group = second_group[:1]
-        if ties == "none" and len(second_group) > 1:
-            return
-        for r, c, _ in second_group:
-            highlights.setdefault((r, c), "second")
+    # Summary and delta cells are never ranked.
+    skip_cols = set(table.get("summary_cols", [])) | set(table.get("delta_cols", []))
+    rows = [r for r in table["rows"] if r not in summary_rows]
+    cols = [c for c in table["cols"] if c not in skip_cols]
 
+    # Each group is (keys, centers) with centers negated where lower is better.
+    groups = []
     if scope == "column":
-        for c in cols:
+        for c in cols if only is None else [c for c in cols if c in only]:
             dir_value = _direction_for_column(spec, c, table.get("delta_map")) if isinstance(direction, dict) else direction
-            items = []
+            sign = 1.0 if dir_value == "max" else -1.0
+            keys, values = [], []
             for r in rows:
-                if r in summary_rows or c in summary_cols or c in delta_cols:
-                    continue
                 cell = cells.get((r, c))
-                if cell is None:
-                    continue
-                items.append((r, c, cell["center"]))
-            apply_group(items, dir_value)
+                if cell is not None:
+                    keys.append((r, c))
+                    values.append(sign * cell["center"])
+            groups.append((keys, values))
     elif scope == "row":
         if isinstance(direction, dict):
             raise ValueError("Row-scope highlighting does not support per-column directions")
-        for r in rows:
-            items = []
+        sign = 1.0 if direction == "max" else -1.0
+        for r in rows if only is None else [r for r in rows if r in only]:
+            keys, values = [], []
             for c in cols:
-                if r in summary_rows or c in summary_cols or c in delta_cols:
-                    continue
                 cell = cells.get((r, c))
-                if cell is None:
-                    continue
-                items.append((r, c, cell["center"]))
-            apply_group(items, direction)
+                if cell is not None:
+                    keys.append((r, c))
+                    values.append(sign * cell["center"])
+            groups.append((keys, values))
     else:  # table
         if isinstance(direction, dict):
             unique = set(direction.values())
             if len(unique) > 1:
                 raise ValueError("Table-scope highlighting requires a single direction")
             direction = next(iter(unique))
-        items = []
-        for (r, c), cell in cells.items():
-            if r in summary_rows or c in summary_cols or c in delta_cols:
+        sign = 1.0 if direction == "max" else -1.0
+        keys, values = [], []
+        # Cell order decides ties="first", so walk cells in insertion order.
+        for key, cell in cells.items():
+            if key[0] in summary_rows or key[1] in skip_cols:
                 continue
-            items.append((r, c, cell["center"]))
-        apply_group(items, direction)
+            keys.append(key)
+            values.append(sign * cell["center"])
+        groups.append((keys, values))
+
+    groups = [group for group in groups if group[0]]
+    if not groups:
+        return {}
+    return rank_groups(groups, k, ties)
 
-    return highlights
 
+def compute_significance(
+    table: Dict[str, Any],
+    spec: Dict[str, Any],
+    cache: BootstrapCache | None = None,
+    jobs: int = 1,
+    only: Any = None,
+) -> Dict[Tuple[Any, Any], str]:
+    """Mark cells whose difference from the baseline row is significant.
 
-def compute_significance(table: Dict[str, Any], spec: Dict[str, Any]) -> Dict[Tuple[Any, Any], str]:
+    ``only`` limits testing to that collection of columns.
+    """
     sig = spec.get("significance")
     if not sig:
         return {}
     baseline = sig["baseline"]
+    method = sig.get("method", "bootstrap_ci")
     level = sig.get("level", 0.95)
-    n_boot = sig.get("n_boot", 1000)
-    seed = sig.get("seed", 0)
     symbol = sig.get("symbol", "*")
     direction = spec["metric"]["direction"]
 
@@ -319,16 +485,24 @@ def compute_significance(table: Dict[str, Any], spec: Dict[str, Any]) -> Dict[Tu
     cells = table["cells"]
 
     if baseline not in rows:
+        if spec["aggregate"].get("low_memory"):
+            _discard_values(cells)
         return markers
 
+    # (column, direction, baseline cell, [(row, cell), ...]) per testable column.
+    columns = []
     for c in cols:
         if c in summary_cols or c in delta_cols:
             continue
+        if only is not None and c not in only:
+            continue
         dir_value = _direction_for_column(spec, c, table.get("delta_map")) if isinstance(direction, dict) else direction
         base_cell = cells.get((baseline, c))
         if base_cell is None:
             continue
-        base_vals = base_cell.get("values") or []
+        if method != "welch_t" and not base_cell.get("values"):
+            continue
+        candidates = []
         for r in rows:
             if r == baseline:
                 continue
@@ -337,25 +511,91 @@ def compute_significance(table: Dict[str, Any], spec: Dict[str, Any]) -> Dict[Tu
             cell = cells.get((r, c))
             if cell is None:
                 continue
-            vals = cell.get("values") or []
-            if not vals or not base_vals:
+            if method != "welch_t" and not cell.get("values"):
                 continue
-            lo, hi = bootstrap_diff_ci(vals, base_vals, mean, level, n_boot, seed)
+            candidates.append((r, cell))
+        if candidates:
+            columns.append((c, dir_value, base_cell, candidates))
+
+    if method == "bootstrap_ci":
+        # One task per column: baseline replicates are drawn once and shared
+        # by every row of that column. Columns are seeded independently, so
+        # they can run on any worker.
+        params = _bootstrap_params(sig, "mean")
+        tasks = [
+            (
+                "bootstrap_diff_ci_batch",
+                [base_cell["values"]] + [cell["values"] for _, cell in candidates],
+                params,
+            )
+            for _, _, base_cell, candidates in columns
+        ]
+        results = _run_bootstrap_tasks(tasks, cache, jobs)
+        column_cis = []
+        for (c, _, _, candidates), (cis, used) in zip(columns, results):
+            for r, cell in candidates:
+                cell["sig_n_boot"] = used
+            column_cis.append(cis)
+    else:
+        column_cis = [
+            [_analytic_diff_ci(cell, base_cell, method, level) for _, cell in candidates]
+            for _, _, base_cell, candidates in columns
+        ]
+
+    for (c, dir_value, _, candidates), cis in zip(columns, column_cis):
+        for (r, _), (lo, hi) in zip(candidates, cis):
             # If direction is min, flip sign so "better" is positive
             if dir_value == "min":
                 lo, hi = -hi, -lo
             if lo > 0:
                 markers[(r, c)] = symbol
+    if spec["aggregate"].get("low_memory"):
+        _discard_values(cells)
     return markers
 
 
-def _apply_summaries(table: Dict[str, Any], spec: Dict[str, Any]) -> None:
+def _cell_moments(cell: Dict[str, Any]) -> Tuple[int, float, float]:
+    values = cell.get("values")
+    if values:
+        return len(values), mean(values), std(values)
+    # Accumulator cells keep their running mean and SD.
+    return cell["n"], cell["mean"], cell["sd"]
+
+
+def _analytic_diff_ci(
+    cell: Dict[str, Any], base_cell: Dict[str, Any], method: str, level: float
+) -> Tuple[float, float]:
+    if method == "paired_t":
+        return paired_diff_interval(
+            cell["values"], cell["over_keys"], base_cell["values"], base_cell["over_keys"], level
+        )
+    n_a, mean_a, sd_a = _cell_moments(cell)
+    n_b, mean_b, sd_b = _cell_moments(base_cell)
+    return welch_diff_interval(mean_a, sd_a, n_a, mean_b, sd_b, n_b, level)
+
+
+def _summary_center(values: List[float], stat: str, agg: Dict[str, Any]) -> float:
+    if stat == "mean":
+        return mean(values)
+    if stat == "median_approx":
+        return sketch_median(values, agg.get("sketch_error", 0.001))
+    return median(values)
+
+
+def _apply_summaries(
+    table: Dict[str, Any],
+    spec: Dict[str, Any],
+    only: Dict[Tuple[Any, Any], None] | None = None,
+) -> None:
     agg = spec.get("aggregate", {})
     row_summary = agg.get("row_summary")
     col_summary = agg.get("col_summary")
     cells = table["cells"]
     table.setdefault("summary_cols", [])
     table.setdefault("summary_rows", [])
+    delta_cols = set(table.get("delta_cols", []))
+    # Summary cells keep the centers they were computed from unless low_memory.
+    low_memory = agg.get("low_memory", False)
 
     if row_summary:
         label = row_summary["label"]
@@ -367,16 +607,16 @@ def _apply_summaries(table: Dict[str, Any], spec: Dict[str, Any]) -> None:
             table["cols"] = [summary_col] + table["cols"]
         else:
             table["cols"].append(summary_col)
-        for r in table["rows"]:
+        for r in table["rows"] if only is None else {r: None for r, _ in only}:
             values = [
                 cells[(r, c)]["center"]
                 for c in table["cols"]
-                if (r, c) in cells and c != summary_col and c not in table.get("delta_cols", [])
+                if (r, c) in cells and c != summary_col and c not in delta_cols
             ]
             if not values:
                 continue
-            center = mean(values) if stat == "mean" else median(values)
-            cells[(r, summary_col)] = {"center": center, "n": len(values), "unc": None, "ci": None, "values": values}
+            center = _summary_center(values, stat, agg)
+            cells[(r, summary_col)] = Cell(center, len(values), values=None if low_memory else values)
 
     if col_summary:
         label = col_summary["label"]
@@ -388,8 +628,12 @@ def _apply_summaries(table: Dict[str, Any], spec: Dict[str, Any]) -> None:
             table["rows"] = [summary_row] + table["rows"]
         else:
             table["rows"].append(summary_row)
-        for c in table["cols"]:
-            if c in table.get("delta_cols", []):
+        # Every summary column cell may change whenever any stat cell does.
+        cols = table["cols"]
+        if only is not None:
+            cols = list({c: None for _, c in only}) + table["summary_cols"]
+        for c in cols:
+            if c in delta_cols:
                 continue
             values = [
                 cells[(r, c)]["center"]
@@ -398,11 +642,15 @@ def _apply_summaries(table: Dict[str, Any], spec: Dict[str, Any]) -> None:
             ]
             if not values:
                 continue
-            center = mean(values) if stat == "mean" else median(values)
-            cells[(summary_row, c)] = {"center": center, "n": len(values), "unc": None, "ci": None, "values": values}
+            center = _summary_center(values, stat, agg)
+            cells[(summary_row, c)] = Cell(center, len(values), values=None if low_memory else values)
 
 
-def _apply_delta_columns(table: Dict[str, Any], spec: Dict[str, Any]) -> None:
+def _apply_delta_columns(
+    table: Dict[str, Any],
+    spec: Dict[str, Any],
+    only: Dict[Tuple[Any, Any], None] | None = None,
+) -> None:
     delta = spec.get("delta")
     if not delta:
         return
@@ -430,6 +678,14 @@ def _apply_delta_columns(table: Dict[str, Any], spec: Dict[str, Any]) -> None:
             return diff if dir_value == "max" else -diff
         return value - base
 
+    # Rows whose delta needs recomputing, per column (all rows when the
+    # baseline cell itself changed).
+    only_rows: Dict[Any, List[Any]] | None = None
+    if only is not None:
+        only_rows = {}
+        for r, col in only:
+            only_rows.setdefault(col, []).append(r)
+
     for col in cols:
         new_cols.append(col)
         if include is not None and col not in include:
@@ -439,7 +695,10 @@ def _apply_delta_columns(table: Dict[str, Any], spec: Dict[str, Any]) -> None:
         delta_cols.append(delta_col)
         delta_map[delta_col] = col
 
-        for r in table["rows"]:
+        rows = table["rows"]
+        if only_rows is not None and (baseline, col) not in only:
+            rows = only_rows.get(col, [])
+        for r in rows:
             base_cell = cells.get((baseline, col))
             cell = cells.get((r, col))
             if base_cell is None or cell is None:
@@ -447,21 +706,15 @@ def _apply_delta_columns(table: Dict[str, Any], spec: Dict[str, Any]) -> None:
             delta_val = compute_delta(cell["center"], base_cell["center"], col)
             if mode == "relative":
                 if base_cell["center"] == 0:
+                    cells.pop((r, delta_col), None)
                     continue
                 delta_val = delta_val / abs(base_cell["center"])
-            cells[(r, delta_col)] = {
-                "center": delta_val,
-                "n": None,
-                "unc": None,
-                "ci": None,
-                "values": None,
-                "delta": True,
-                "delta_mode": mode,
-            }
+            cells[(r, delta_col)] = Cell(delta_val, delta=True, delta_mode=mode)
 
     if position == "end":
-        base_cols = [c for c in cols if c not in delta_cols]
-        delta_only = [c for c in new_cols if c in delta_cols]
+        delta_set = set(delta_cols)
+        base_cols = [c for c in cols if c not in delta_set]
+        delta_only = [c for c in new_cols if c in delta_set]
         table["cols"] = base_cols + delta_only
     else:
         table["cols"] = new_cols
@@ -471,12 +724,13 @@ def _apply_delta_columns(table: Dict[str, Any], spec: Dict[str, Any]) -> None:
 
     groups = spec.get("cols", {}).get("groups") or []
     if groups and position == "after":
+        delta_for: Dict[Any, List[Any]] = {}
+        for dcol, base in delta_map.items():
+            delta_for.setdefault(base, []).append(dcol)
         for group in groups:
             members = group.get("members", [])
             updated = []
             for m in members:
                 updated.append(m)
-                for dcol, base in delta_map.items():
-                    if base == m:
-                        updated.append(dcol)
+                updated.extend(delta_for.get(m, []))
             group["members"] = updated
@@ -0,0 +1,209 @@
+"""Binary columnar sidecar cache for parsed record files.
+
+The first load of ``results.jsonl`` parses it into ``RecordColumns`` and
+writes ``results.jsonl.tgcols`` next to it: a JSON header (source stamp,
+interned label lists) followed by fixed-width arrays (int64 label codes per
+field, float64 values). Later loads memory-map the arrays instead of parsing
+JSON, so startup cost and resident memory no longer grow with the file.
+
+The cache is used while the source keeps its size and mtime. If only the
+mtime changed, the source's content hash decides. Files whose records do not
+all share one key set (or hold non-scalar labels) are not columnar; a small
+marker records that so they are not re-examined on every load. Cache
+failures are never fatal: loading falls back to parsing the source.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from .columnar import LabelColumn, RecordColumns
+from .loaders import open_records, records_suffix
+
+CACHE_SUFFIX = ".tgcols"
+_MAGIC = b"TGCOLS1\n"
+_VERSION = 1
+_ALIGN = 8
+
+
+def sidecar_path(path: str) -> str:
+    return path + CACHE_SUFFIX
+
+
+def _stamp(path: str) -> Dict[str, int]:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _content_hash(path: str) -> str:
+    # Hashes the decompressed records, like the digest taken while parsing.
+    digest = hashlib.sha256()
+    with open_records(path) as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_columns(path: str) -> Optional[RecordColumns]:
+    """Records of a JSON/JSONL file as ``RecordColumns``, via the sidecar cache.
+
+    Returns None when the file's records cannot be stored as columns; the
+    caller then loads records the usual way.
+    """
+    cached = _read_cache(path)
+    if cached is not None:
+        return cached or None
+    stamp = _stamp(path)
+    digest = hashlib.sha256()
+    columns = _parse_columns(path, digest)
+    header: Dict[str, Any] = {
+        "version": _VERSION,
+        "byteorder": sys.byteorder,
+        "source": dict(stamp, sha256=digest.hexdigest()),
+    }
+    if _stamp(path) != stamp:
+        # The source changed while it was read; use it, but do not cache it.
+        return columns
+    _write_cache(path, header, columns)
+    return columns
+
+
+def _parse_columns(path: str, digest: Any) -> Optional[RecordColumns]:
+    """Parse ``path`` into columns while hashing its bytes; None if it is not columnar."""
+    with open_records(path) as handle:
+        if records_suffix(path) == ".jsonl":
+            columns = _to_columns(_jsonl_records(handle, digest))
+        else:
+            data = handle.read()
+            digest.update(data)
+            records = json.loads(data)
+            if not isinstance(records, list):
+                raise ValueError("Records JSON must be a list")
+            columns = _to_columns(records)
+        # Hash whatever the parser left unread after stopping early.
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return columns
+
+
+def _to_columns(records: Iterable[Any]) -> Optional[RecordColumns]:
+    columns: Optional[RecordColumns] = None
+    keys: Any = None
+    for rec in records:
+        if columns is None:
+            if not isinstance(rec, dict) or "value" not in rec:
+                return None
+            keys = rec.keys()
+            columns = RecordColumns([key for key in rec if key != "value"])
+        elif not isinstance(rec, dict) or rec.keys() != keys:
+            return None
+        try:
+            columns.append(rec)
+        except (TypeError, ValueError):
+            # An unhashable label or a non-numeric value.
+            return None
+    return columns
+
+
+def _jsonl_records(handle: Any, digest: Any) -> Iterator[Dict[str, Any]]:
+    for line in handle:
+        digest.update(line)
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _write_cache(path: str, header: Dict[str, Any], columns: Optional[RecordColumns]) -> None:
+    arrays = []
+    if columns is None:
+        header["columnar"] = False
+    else:
+        header["columnar"] = True
+        header["count"] = len(columns)
+        header["fields"] = [
+            {"name": name, "labels": column.labels} for name, column in columns.labels.items()
+        ]
+        arrays = [column.codes for column in columns.labels.values()] + [columns.values]
+    try:
+        blob = json.dumps(header).encode("utf-8")
+    except (TypeError, ValueError):
+        return
+    prefix = len(_MAGIC) + 8 + len(blob)
+    blob += b" " * (-prefix % _ALIGN)
+    target = sidecar_path(path)
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)), suffix=CACHE_SUFFIX)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(_MAGIC)
+            handle.write(struct.pack("<q", len(blob)))
+            handle.write(blob)
+            for array in arrays:
+                array.tofile(handle)
+        # mkstemp creates 0600 files; give the sidecar the usual permissions.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, target)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+
+
+def _read_cache(path: str) -> Optional[Any]:
+    """Cached columns, ``False`` for a fresh not-columnar marker, or None on a miss."""
+    target = sidecar_path(path)
+    try:
+        with open(target, "rb") as handle:
+            if handle.read(len(_MAGIC)) != _MAGIC:
+                return None
+            (length,) = struct.unpack("<q", handle.read(8))
+            header = json.loads(handle.read(length))
+            if header.get("version") != _VERSION or header.get("byteorder") != sys.byteorder:
+                return None
+            if not _is_fresh(path, header["source"]):
+                return None
+            if not header["columnar"]:
+                return False
+            count = header["count"]
+            offset = len(_MAGIC) + 8 + length
+            if os.fstat(handle.fileno()).st_size < offset + 8 * count * (len(header["fields"]) + 1):
+                return None
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+    return _columns(header, memoryview(buffer), offset, count)
+
+
+def _is_fresh(path: str, source: Dict[str, Any]) -> bool:
+    stamp = _stamp(path)
+    if stamp["size"] != source["size"]:
+        return False
+    if stamp["mtime_ns"] == source["mtime_ns"]:
+        return True
+    # Touched or copied: reuse the cache only if the bytes are unchanged.
+    return _content_hash(path) == source["sha256"]
+
+
+def _columns(header: Dict[str, Any], buffer: Any, offset: int, count: int) -> RecordColumns:
+    """``RecordColumns`` whose code and value arrays are read-only views into ``buffer``."""
+    width = 8 * count
+
+    def view(start: int, fmt: str) -> Any:
+        return buffer[start : start + width].cast(fmt)
+
+    columns = RecordColumns([])
+    for idx, field in enumerate(header["fields"]):
+        columns.labels[field["name"]] = LabelColumn(field["labels"], view(offset + idx * width, "q"))
+    columns.values = view(offset + len(header["fields"]) * width, "d")
+    return columns
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Tuple
 
+from .schema import HIGHLIGHT_TIERS
+
 
 def _escape_latex(text: str) -> str:
     replacements = {
@@ -170,8 +172,9 @@ def render_latex(
     row_groups = spec.get("rows", {}).get("groups") or []
     group_map = {}
     group_last = {}
+    row_set = set(rows)
     for group in row_groups:
-        members = [m for m in group.get("members", []) if m in rows]
+        members = [m for m in group.get("members", []) if m in row_set]
         for member in members:
             group_map[member] = group
         if members:
@@ -232,7 +235,7 @@ def render_latex(
         preamble.append("booktabs")
     if any(
         (spec.get("highlight", {}).get(k, {}).get("style", "").startswith("cellcolor:"))
-        for k in ("best", "second")
+        for k in HIGHLIGHT_TIERS
     ):
         preamble.append("xcolor")
     if tabular_name == "tabularx":
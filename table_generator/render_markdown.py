@@ -117,8 +117,9 @@ def render_markdown(
     row_groups = spec.get("rows", {}).get("groups") or []
     group_map = {}
     group_last = {}
+    row_set = set(rows)
     for group in row_groups:
-        members = [m for m in group.get("members", []) if m in rows]
+        members = [m for m in group.get("members", []) if m in row_set]
         for member in members:
             group_map[member] = group
         if members:
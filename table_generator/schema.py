@@ -43,14 +43,22 @@ DEFAULTS = {
 
 
 VALID_FORMATS = {"latex", "markdown"}
+VALID_INPUT_FORMATS = {"records", "nested"}
 VALID_FORMAT_MODES = {"pm", "ci_brackets"}
-VALID_STATS = {"mean", "median"}
+VALID_STATS = {"mean", "median", "median_approx"}
+VALID_ENGINES = {"records", "columnar"}
 VALID_UNCERTAINTY = {"none", "std", "sem", "ci"}
-VALID_CI_METHODS = {"bootstrap_percentile"}
+VALID_CI_METHODS = {"bootstrap_percentile", "t_interval", "order_statistic"}
+# Analytic CI methods and the only stat each one is defined for.
+ANALYTIC_CI_STATS = {"t_interval": ("mean",), "order_statistic": ("median", "median_approx")}
+VALID_BOOTSTRAP_BACKENDS = {"auto", "python", "numpy"}
+VALID_SIGNIFICANCE_METHODS = {"bootstrap_ci", "welch_t", "paired_t"}
 VALID_DIRECTION = {"min", "max"}
 VALID_HIGHLIGHT_SCOPE = {"column", "row", "table"}
 VALID_HIGHLIGHT_STYLE = {"bold", "underline"}
 VALID_TIES = {"all", "first", "none"}
+# Highlight tiers in rank order; a spec may style any prefix of these.
+HIGHLIGHT_TIERS = ("best", "second", "third", "fourth", "fifth")
 
 
 def _path_err(path: str, message: str) -> SchemaError:
@@ -68,6 +76,19 @@ def _merge_defaults(spec: Dict[str, Any]) -> Dict[str, Any]:
     return merged
 
 
+def _validate_adaptive(block: Dict[str, Any], n_boot: int, path: str) -> None:
+    precision = block.get("precision")
+    if precision is None:
+        if "max_boot" in block:
+            raise _path_err(f"{path}.max_boot", "max_boot requires precision")
+        return
+    if isinstance(precision, bool) or not isinstance(precision, (int, float)) or precision <= 0:
+        raise _path_err(f"{path}.precision", "precision must be a positive number")
+    max_boot = block.get("max_boot", 10 * n_boot)
+    if not isinstance(max_boot, int) or max_boot < n_boot:
+        raise _path_err(f"{path}.max_boot", "max_boot must be an int >= n_boot")
+
+
 def validate_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(spec, dict):
         raise _path_err("spec", "Spec must be a dict")
@@ -140,6 +161,24 @@ def validate_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
     if stat not in VALID_STATS:
         raise _path_err("spec.aggregate.stat", "Unsupported stat")
 
+    sketch_error = agg.get("sketch_error", 0.001)
+    if isinstance(sketch_error, bool) or not isinstance(sketch_error, (int, float)) or not (
+        0 < sketch_error < 0.5
+    ):
+        raise _path_err("spec.aggregate.sketch_error", "sketch_error must be between 0 and 0.5")
+
+    keep_values = agg.get("keep_values")
+    if keep_values is not None and not isinstance(keep_values, bool):
+        raise _path_err("spec.aggregate.keep_values", "Must be true or false")
+    low_memory = agg.get("low_memory")
+    if low_memory is not None and not isinstance(low_memory, bool):
+        raise _path_err("spec.aggregate.low_memory", "Must be true or false")
+    if low_memory and keep_values:
+        raise _path_err("spec.aggregate.low_memory", "Cannot be combined with keep_values")
+
+    if agg.get("engine", "records") not in VALID_ENGINES:
+        raise _path_err("spec.aggregate.engine", "Must be 'records' or 'columnar'")
+
     unc = agg.get("uncertainty", {"type": "none"})
     if not isinstance(unc, dict):
         raise _path_err("spec.aggregate.uncertainty", "Must be an object")
@@ -147,14 +186,25 @@ def validate_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
     if unc_type not in VALID_UNCERTAINTY:
         raise _path_err("spec.aggregate.uncertainty.type", "Unsupported uncertainty type")
     if unc_type == "ci":
-        if unc.get("method", "bootstrap_percentile") not in VALID_CI_METHODS:
+        method = unc.get("method", "bootstrap_percentile")
+        if method not in VALID_CI_METHODS:
             raise _path_err("spec.aggregate.uncertainty.method", "Unsupported CI method")
+        if method in ANALYTIC_CI_STATS and stat not in ANALYTIC_CI_STATS[method]:
+            raise _path_err(
+                "spec.aggregate.uncertainty.method",
+                f"CI method '{method}' requires stat '{ANALYTIC_CI_STATS[method][0]}'",
+            )
         level = unc.get("level", 0.95)
         if not (0 < level < 1):
             raise _path_err("spec.aggregate.uncertainty.level", "CI level must be between 0 and 1")
         n_boot = unc.get("n_boot", 1000)
         if not isinstance(n_boot, int) or n_boot <= 0:
             raise _path_err("spec.aggregate.uncertainty.n_boot", "n_boot must be a positive int")
+        if unc.get("backend", "python") not in VALID_BOOTSTRAP_BACKENDS:
+            raise _path_err(
+                "spec.aggregate.uncertainty.backend", "Must be 'auto', 'python', or 'numpy'"
+            )
+        _validate_adaptive(unc, n_boot, "spec.aggregate.uncertainty")
 
     # Summary rows/cols
     for key in ("row_summary", "col_summary"):
@@ -199,7 +249,7 @@ def validate_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
         ties = highlight.get("ties", "all")
         if ties not in VALID_TIES:
             raise _path_err("spec.highlight.ties", "Unsupported ties mode")
-        for key in ("best", "second"):
+        for key in HIGHLIGHT_TIERS:
             if key in highlight:
                 style = highlight[key].get("style")
                 if style is None:
@@ -247,14 +297,27 @@ def validate_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
         if scope not in ("column",):
             raise _path_err("spec.significance.scope", "Only 'column' is supported")
         method = sig.get("method", "bootstrap_ci")
-        if method not in ("bootstrap_ci",):
-            raise _path_err("spec.significance.method", "Only 'bootstrap_ci' is supported")
+        if method not in VALID_SIGNIFICANCE_METHODS:
+            raise _path_err(
+                "spec.significance.method", "Must be 'bootstrap_ci', 'welch_t', or 'paired_t'"
+            )
         level = sig.get("level", 0.95)
         if not (0 < level < 1):
             raise _path_err("spec.significance.level", "level must be between 0 and 1")
         n_boot = sig.get("n_boot", 1000)
         if not isinstance(n_boot, int) or n_boot <= 0:
             raise _path_err("spec.significance.n_boot", "n_boot must be a positive int")
+        if sig.get("backend", "python") not in VALID_BOOTSTRAP_BACKENDS:
+            raise _path_err("spec.significance.backend", "Must be 'auto', 'python', or 'numpy'")
+        _validate_adaptive(sig, n_boot, "spec.significance")
+
+    # Records input
+    input_block = merged.get("input")
+    if input_block is not None:
+        if not isinstance(input_block, dict):
+            raise _path_err("spec.input", "Must be an object")
+        if input_block.get("format", "records") not in VALID_INPUT_FORMATS:
+            raise _path_err("spec.input.format", "Must be 'records' or 'nested'")
 
     # Delta vs baseline columns
     delta = merged.get("delta")
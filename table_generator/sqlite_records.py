@@ -0,0 +1,205 @@
+"""Records stored in a SQLite table, grouped inside the database.
+
+``SqliteRecords`` stands in for a record list: ``pipeline._aggregate`` asks
+it for a cell grouping, and it answers with SQL. The metric filter and the
+row/col/over projection always run in SQLite. When no stage needs raw values
+(mean/std/sem tables, t-interval CIs, Welch tests), each cell's count, sum
+and squared deviations from its mean are aggregated in SQL and no record
+reaches Python. Otherwise the selected rows stream from a cursor into the
+record grouper.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import sqlite3
+from typing import Any, Dict, Iterator, List, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .columnar import spec_fields
+from .index import Grouping, group_records
+from .stats import RunningStats
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def is_sqlite_url(value: str) -> bool:
+    """True for ``sqlite:///...`` record sources."""
+    return value.startswith("sqlite:")
+
+
+class SqliteRecords:
+    """Records in one table of a SQLite database, one row per record.
+
+    Rows are read in ``rowid`` order, which plays the role of record order
+    (first-seen row/column order). ``value`` is read as REAL.
+    """
+
+    def __init__(self, path: str, table: str) -> None:
+        if not os.path.exists(path):
+            raise ValueError(f"SQLite database '{path}' does not exist")
+        self.path = path
+        self.table = table
+        # A file URI keeps '?', '#' and '%' in the path from being read as URI syntax.
+        uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+        try:
+            self.connection = sqlite3.connect(uri, uri=True)
+        except sqlite3.Error as exc:
+            raise ValueError(f"Cannot open SQLite database '{path}': {exc}") from None
+        try:
+            columns = self.connection.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+        except sqlite3.Error as exc:
+            self.connection.close()
+            raise ValueError(f"Cannot read SQLite database '{path}': {exc}") from None
+        if not columns:
+            self.connection.close()
+            raise ValueError(f"SQLite database '{path}' has no table '{table}'")
+        self.columns = [column[1] for column in columns]
+        self._groupings: Dict[str, Grouping] = {}
+
+    @classmethod
+    def from_url(cls, url: str) -> "SqliteRecords":
+        """Open ``sqlite:///relative.db?table=runs`` or ``sqlite:////abs/path.db?table=runs``.
+
+        The path is percent-decoded, so ``%3F``, ``%23`` and ``%25`` stand for ``?``, ``#`` and ``%``.
+        """
+        parts = urlsplit(url)
+        if parts.scheme != "sqlite" or not parts.path.startswith("/"):
+            raise ValueError("SQLite records must be given as sqlite:///path.db?table=NAME")
+        table = parse_qs(parts.query).get("table")
+        if not table:
+            raise ValueError("SQLite records URL needs a ?table=NAME parameter")
+        return cls(unquote(parts.path[1:]), table[0])
+
+    def __len__(self) -> int:
+        return self.connection.execute(f"SELECT COUNT(*) FROM {_quote(self.table)}").fetchone()[0]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield every row as a record dict (slow path for code that needs mappings)."""
+        cursor = self.connection.execute(f"SELECT * FROM {_quote(self.table)} ORDER BY rowid")
+        for row in cursor:
+            yield dict(zip(self.columns, row))
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def group(
+        self,
+        spec: Dict[str, Any],
+        keep_values: bool,
+        keep_over_keys: bool,
+        sketch_error: float | None,
+    ) -> Grouping:
+        """Group the rows ``spec`` selects into cells (same shape as ``RecordIndex.group``)."""
+        key = json.dumps(
+            [
+                spec["metric"]["field"],
+                spec["metric"]["value"],
+                spec["rows"]["field"],
+                spec["rows"].get("rename"),
+                spec["cols"]["field"],
+                spec["cols"].get("rename"),
+                spec["aggregate"]["over"],
+                keep_values,
+                keep_over_keys,
+                sketch_error,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        grouping = self._groupings.get(key)
+        if grouping is None:
+            self._check_fields(spec)
+            try:
+                if keep_values or sketch_error is not None:
+                    grouping = group_records(
+                        self._select(spec), spec, keep_values, keep_over_keys, sketch_error
+                    )
+                else:
+                    grouping = self._group_moments(spec)
+            except sqlite3.Error as exc:
+                raise ValueError(f"SQLite query on '{self.path}' failed: {exc}") from None
+            self._groupings[key] = grouping
+        return grouping
+
+    def _check_fields(self, spec: Dict[str, Any]) -> None:
+        metric_field = spec["metric"]["field"]
+        if metric_field not in self.columns:
+            raise ValueError(f"Missing metric field '{metric_field}' in record")
+        if spec["rows"]["field"] not in self.columns or spec["cols"]["field"] not in self.columns:
+            raise ValueError("Record missing row/col field")
+        if "value" not in self.columns:
+            raise ValueError("Record missing 'value'")
+
+    def _select(self, spec: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Stream the selected rows as records holding only the fields ``spec`` reads."""
+        metric_field = spec["metric"]["field"]
+        metric_value = spec["metric"]["value"]
+        fields = [field for field in spec_fields(spec) if field in self.columns]
+        select = ", ".join(_quote(field) for field in fields)
+        cursor = self.connection.execute(
+            f"SELECT {select}, CAST(value AS REAL) FROM {_quote(self.table)}"
+            f" WHERE {_quote(metric_field)} = ? ORDER BY rowid",
+            (metric_value,),
+        )
+        for row in cursor:
+            if row[-1] is None:
+                raise ValueError("Record missing 'value'")
+            rec = dict(zip(fields, row))
+            rec[metric_field] = metric_value
+            rec["value"] = row[-1]
+            yield rec
+
+    def _group_moments(self, spec: Dict[str, Any]) -> Grouping:
+        """Per-cell count, sum and M2 from SQL, without loading records.
+
+        The first aggregate takes each cell's mean; M2 is then summed as
+        squared deviations from it, which stays accurate when the mean is
+        large next to the spread (``SUM(v*v) - SUM(v)*mean`` does not).
+        """
+        row_field = _quote(spec["rows"]["field"])
+        col_field = _quote(spec["cols"]["field"])
+        row_rename = spec["rows"].get("rename") or {}
+        col_rename = spec["cols"].get("rename") or {}
+        metric_field = _quote(spec["metric"]["field"])
+        table = _quote(self.table)
+        # Cell columns are qualified so they never clash with the table's own.
+        value = f"CAST({table}.value AS REAL)"
+        cursor = self.connection.execute(
+            f"WITH cell AS (SELECT {row_field} AS r, {col_field} AS c, SUM(value IS NULL) AS missing,"
+            f" COUNT(*) AS n, SUM(CAST(value AS REAL)) AS total, AVG(CAST(value AS REAL)) AS mean,"
+            f" MIN(rowid) AS first FROM {table} WHERE {metric_field} = ?1 GROUP BY 1, 2)"
+            f" SELECT cell.r, cell.c, cell.missing, cell.n, cell.total,"
+            f" SUM(({value} - cell.mean) * ({value} - cell.mean)), cell.first"
+            f" FROM {table} JOIN cell ON {table}.{row_field} IS cell.r AND {table}.{col_field} IS cell.c"
+            f" WHERE {table}.{metric_field} = ?1 GROUP BY cell.first ORDER BY cell.first",
+            (spec["metric"]["value"],),
+        )
+        row_seen: Dict[Any, None] = {}
+        col_seen: Dict[Any, None] = {}
+        moments: Dict[Tuple[Any, Any], List[float]] = {}
+        for row, col, missing, count, total, m2, _ in cursor:
+            if missing:
+                raise ValueError("Record missing 'value'")
+            row = row_rename.get(row, row)
+            col = col_rename.get(col, col)
+            row_seen.setdefault(row)
+            col_seen.setdefault(col)
+            acc = moments.get((row, col))
+            if acc is None:
+                moments[(row, col)] = [count, total, m2]
+                continue
+            # Renames merged two cells: combine them with Chan's parallel formula.
+            n_a, total_a, m2_a = acc
+            delta = total / count - total_a / n_a
+            acc[0] = n_a + count
+            acc[1] = total_a + total
+            acc[2] = m2_a + m2 + delta * delta * n_a * count / acc[0]
+        grouped: Dict[Tuple[Any, Any], Any] = {
+            key: RunningStats.from_moments(count, total, m2) for key, (count, total, m2) in moments.items()
+        }
+        return list(row_seen), list(col_seen), grouped, {}
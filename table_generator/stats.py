@@ -2,9 +2,23 @@
 
 from __future__ import annotations
 
+import bisect
 import math
 import random
-from typing import Callable, List, Tuple
+from functools import lru_cache
+from statistics import NormalDist
+from typing import Any, Callable, List, Tuple
+
+try:  # Optional vectorized bootstrap backend.
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+
+BOOTSTRAP_BACKENDS = ("auto", "python", "numpy")
+
+# Upper bound on resample indices materialized at once by the NumPy backend.
+_MAX_CHUNK_ELEMENTS = 1 << 22
 
 
 def mean(values: List[float]) -> float:
@@ -36,25 +50,410 @@ def sem(values: List[float]) -> float:
     return std(values) / math.sqrt(n)
 
 
+def resolve_backend(backend: str = "auto") -> str:
+    """Map a requested bootstrap backend to the one that will actually run."""
+    if backend not in BOOTSTRAP_BACKENDS:
+        raise ValueError(f"Unknown bootstrap backend '{backend}'")
+    if backend == "auto":
+        return "numpy" if np is not None else "python"
+    if backend == "numpy" and np is None:
+        raise ValueError("Bootstrap backend 'numpy' requested but numpy is not installed")
+    return backend
+
+
+def _percentile_indices(level: float, n_boot: int) -> Tuple[int, int]:
+    alpha = (1.0 - level) / 2.0
+    lo_idx = int(math.floor(alpha * (n_boot - 1)))
+    hi_idx = int(math.ceil((1.0 - alpha) * (n_boot - 1)))
+    return lo_idx, hi_idx
+
+
+def _vector_stat_name(stat_fn: Callable[[List[float]], float]) -> str | None:
+    if stat_fn is mean:
+        return "mean"
+    if stat_fn is median:
+        return "median"
+    return None
+
+
+def _numpy_replicates(values: Any, stat_name: str, n_boot: int, rng: Any) -> Any:
+    """Return ``n_boot`` bootstrap replicates of ``stat_name`` over ``values``.
+
+    Resample indices are drawn as an (n_boot x n) matrix, in row chunks so the
+    matrix never exceeds ``_MAX_CHUNK_ELEMENTS`` entries.
+    """
+    data = np.asarray(values, dtype=float)
+    n = data.shape[0]
+    reduce = np.mean if stat_name == "mean" else np.median
+    out = np.empty(n_boot, dtype=float)
+    chunk = max(1, _MAX_CHUNK_ELEMENTS // n)
+    for start in range(0, n_boot, chunk):
+        stop = min(start + chunk, n_boot)
+        idx = rng.integers(0, n, size=(stop - start, n))
+        out[start:stop] = reduce(data[idx], axis=1)
+    return out
+
+
+def _numpy_group_replicates(groups: List[List[float]], stat_name: str, n_boot: int, rngs: List[Any]) -> Any:
+    """Return a (len(groups) x n_boot) matrix of replicates for ragged groups.
+
+    Each group draws from its own generator in ``rngs``, so a group's
+    replicates do not depend on the other groups. For the mean, the
+    resampling itself is one vectorized pass: the groups are concatenated,
+    one uniform draw per element selects an index within its own group, and
+    per-group sums come from ``np.add.reduceat``.
+    """
+    if stat_name != "mean":
+        return np.stack([_numpy_replicates(group, stat_name, n_boot, rng) for group, rng in zip(groups, rngs)])
+    lengths = np.array([len(group) for group in groups], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    data = np.concatenate([np.asarray(group, dtype=float) for group in groups])
+    total = data.shape[0]
+    elem_len = np.repeat(lengths, lengths)
+    elem_off = np.repeat(offsets, lengths)
+    out = np.empty((len(groups), n_boot), dtype=float)
+    chunk = max(1, _MAX_CHUNK_ELEMENTS // total)
+    for start in range(0, n_boot, chunk):
+        stop = min(start + chunk, n_boot)
+        draws = np.concatenate([rng.random((stop - start, len(group))) for group, rng in zip(groups, rngs)], axis=1)
+        idx = elem_off + (draws * elem_len).astype(np.int64)
+        sums = np.add.reduceat(data[idx], offsets, axis=1)
+        out[:, start:stop] = (sums / lengths).T
+    return out
+
+
+def _candidate_rngs(seed: int, count: int) -> List[Any]:
+    """One NumPy generator per candidate, each seeded from ``seed`` alone.
+
+    Every candidate gets the same stream, independent of the baseline's
+    ``default_rng(seed)``, so a candidate's CI does not depend on which other
+    candidates are in the batch or in what order.
+    """
+    return [np.random.default_rng([seed, 1]) for _ in range(count)]
+
+
+def _numpy_percentiles(replicates: Any, level: float) -> Tuple[float, float]:
+    lo_idx, hi_idx = _percentile_indices(level, replicates.shape[0])
+    selected = np.partition(replicates, (lo_idx, hi_idx))
+    return (float(selected[lo_idx]), float(selected[hi_idx]))
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction for the regularized incomplete beta (modified Lentz)."""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-15:
+            break
+    return h
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = (
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+        + a * math.log(x) + b * math.log1p(-x)
+    )
+    front = math.exp(log_front)
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def t_cdf(t: float, df: float) -> float:
+    tail = 0.5 * _betainc(df / 2.0, 0.5, df / (df + t * t))
+    return 1.0 - tail if t > 0 else tail
+
+
+@lru_cache(maxsize=4096)
+def t_quantile(p: float, df: float) -> float:
+    """Inverse Student-t CDF by bisection on ``t_cdf``."""
+    if p == 0.5:
+        return 0.0
+    if p < 0.5:
+        return -t_quantile(1.0 - p, df)
+    lo, hi = 0.0, max(1.0, 2.0 * NormalDist().inv_cdf(p))
+    while t_cdf(hi, df) < p:
+        lo, hi = hi, hi * 2.0
+    for _ in range(200):
+        mid = 0.5 * (lo + hi)
+        if t_cdf(mid, df) < p:
+            lo = mid
+        else:
+            hi = mid
+        if hi - lo <= 1e-12 * max(1.0, hi):
+            break
+    return 0.5 * (lo + hi)
+
+
+def t_interval_from_summary(center: float, sd: float, n: int, level: float) -> Tuple[float, float]:
+    """Student-t CI for the mean from count, mean and sample SD."""
+    if n <= 1:
+        return (center, center)
+    half = t_quantile(0.5 + level / 2.0, n - 1) * sd / math.sqrt(n)
+    return (center - half, center + half)
+
+
+def t_interval(values: List[float], level: float) -> Tuple[float, float]:
+    n = len(values)
+    if n == 0:
+        return (float("nan"), float("nan"))
+    return t_interval_from_summary(mean(values), std(values), n, level)
+
+
+def welch_diff_interval(
+    mean_a: float,
+    sd_a: float,
+    n_a: int,
+    mean_b: float,
+    sd_b: float,
+    n_b: int,
+    level: float,
+) -> Tuple[float, float]:
+    """Welch (unequal-variance) t CI for ``mean_a - mean_b`` from summary statistics."""
+    if n_a < 2 or n_b < 2:
+        return (float("nan"), float("nan"))
+    var_a = sd_a * sd_a / n_a
+    var_b = sd_b * sd_b / n_b
+    se2 = var_a + var_b
+    diff = mean_a - mean_b
+    if se2 == 0:
+        return (diff, diff)
+    df = se2 * se2 / (var_a * var_a / (n_a - 1) + var_b * var_b / (n_b - 1))
+    half = t_quantile(0.5 + level / 2.0, df) * math.sqrt(se2)
+    return (diff - half, diff + half)
+
+
+def paired_diff_interval(
+    values_a: List[float],
+    keys_a: List[Any],
+    values_b: List[float],
+    keys_b: List[Any],
+    level: float,
+) -> Tuple[float, float]:
+    """Paired t CI for the mean of ``a - b`` over observations sharing a key.
+
+    Each key must occur at most once per side; a repeated key (e.g., two
+    methods merged by ``rows.rename`` with the same seeds) raises ValueError.
+    """
+    for keys in (keys_a, keys_b):
+        seen = set()
+        for key in keys:
+            if key in seen:
+                raise ValueError(
+                    "paired_t needs one observation per aggregate.over key in each cell; "
+                    f"key {key!r} repeats"
+                )
+            seen.add(key)
+    by_key = dict(zip(keys_b, values_b))
+    diffs = [value - by_key[key] for key, value in zip(keys_a, values_a) if key in by_key]
+    if len(diffs) < 2:
+        return (float("nan"), float("nan"))
+    return t_interval(diffs, level)
+
+
+def median_order_interval(values: List[float], level: float) -> Tuple[float, float]:
+    """Distribution-free CI for the median from order statistics.
+
+    With B ~ Binomial(n, 1/2), ``[x_(l), x_(n+1-l)]`` covers the median with
+    probability ``1 - 2 P(B <= l - 1)``; ``l`` is the largest rank keeping
+    that at or above ``level``. Tiny samples fall back to the full range.
+    """
+    n = len(values)
+    if n == 0:
+        return (float("nan"), float("nan"))
+    ordered = sorted(values)
+    alpha = (1.0 - level) / 2.0
+    log_half = n * math.log(0.5)
+    log_n_fact = math.lgamma(n + 1)
+    cdf = 0.0
+    rank = 1
+    for k in range(0, (n + 1) // 2):
+        cdf += math.exp(log_n_fact - math.lgamma(k + 1) - math.lgamma(n - k + 1) + log_half)
+        if cdf > alpha:
+            break
+        rank = k + 1
+    rank = min(rank, (n + 1) // 2)
+    return (ordered[rank - 1], ordered[n - rank])
+
+
+class QuantileSketch:
+    """Greenwald-Khanna quantile sketch.
+
+    Any quantile query is answered with a value whose rank is within
+    ``error * count`` of the requested rank, using O((1/error) log(error * count))
+    memory. Until the first compression every value is held exactly, so small
+    groups return the exact median.
+    """
+
+    __slots__ = ("error", "count", "_values", "_g", "_delta", "_period")
+
+    def __init__(self, error: float = 0.001) -> None:
+        self.error = error
+        self.count = 0
+        self._values: List[float] = []
+        self._g: List[int] = []
+        self._delta: List[int] = []
+        self._period = max(1, int(1.0 / (2.0 * error)))
+
+    def push(self, value: float) -> None:
+        idx = bisect.bisect_right(self._values, value)
+        if idx == 0 or idx == len(self._values):
+            delta = 0
+        else:
+            delta = int(math.floor(2.0 * self.error * self.count))
+        self._values.insert(idx, value)
+        self._g.insert(idx, 1)
+        self._delta.insert(idx, delta)
+        self.count += 1
+        if self.count % self._period == 0:
+            self._compress()
+
+    def _compress(self) -> None:
+        threshold = int(math.floor(2.0 * self.error * self.count))
+        values, g, delta = self._values, self._g, self._delta
+        if len(values) < 3:
+            return
+        # Walk right to left, folding a tuple into its right neighbour when the
+        # merged band still fits the error budget. The minimum is never merged.
+        out_v, out_g, out_d = [values[-1]], [g[-1]], [delta[-1]]
+        for i in range(len(values) - 2, 0, -1):
+            if g[i] + out_g[-1] + out_d[-1] <= threshold:
+                out_g[-1] += g[i]
+            else:
+                out_v.append(values[i])
+                out_g.append(g[i])
+                out_d.append(delta[i])
+        out_v.append(values[0])
+        out_g.append(g[0])
+        out_d.append(delta[0])
+        out_v.reverse()
+        out_g.reverse()
+        out_d.reverse()
+        self._values, self._g, self._delta = out_v, out_g, out_d
+
+    def quantile(self, phi: float) -> float:
+        if self.count == 0:
+            return float("nan")
+        rank = max(1, int(math.ceil(phi * self.count)))
+        bound = self.error * self.count
+        rmin = 0
+        for value, g, delta in zip(self._values, self._g, self._delta):
+            rmin += g
+            if rank - rmin <= bound and rmin + delta - rank <= bound:
+                return value
+        return self._values[-1]
+
+    def median(self) -> float:
+        if self.count == 0:
+            return float("nan")
+        if len(self._values) == self.count:
+            return median(self._values)
+        return self.quantile(0.5)
+
+
+def sketch_median(values: List[float], error: float = 0.001) -> float:
+    sketch = QuantileSketch(error)
+    for value in values:
+        sketch.push(value)
+    return sketch.median()
+
+
+class RunningStats:
+    """Streaming accumulator holding only count, sum and M2 for a stream of values.
+
+    The mean is ``total / count``, the same left-to-right sum ``mean`` takes,
+    so streamed and list-based cells print the same center. M2 is updated
+    with Welford's method against a separate running mean. Pass
+    ``sketch_error`` to also feed a ``QuantileSketch`` for an approximate
+    median.
+    """
+
+    __slots__ = ("count", "total", "m2", "_running_mean", "sketch")
+
+    def __init__(self, sketch_error: float | None = None) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.m2 = 0.0
+        self._running_mean = 0.0
+        self.sketch = QuantileSketch(sketch_error) if sketch_error is not None else None
+
+    @classmethod
+    def from_moments(cls, count: int, total: float, m2: float) -> "RunningStats":
+        """Build an accumulator from precomputed count, sum and M2."""
+        acc = cls()
+        acc.count = count
+        acc.total = total
+        acc.m2 = m2
+        acc._running_mean = acc.mean
+        return acc
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self._running_mean
+        self._running_mean += delta / self.count
+        self.m2 += delta * (value - self._running_mean)
+        if self.sketch is not None:
+            self.sketch.push(value)
+
+    def std(self) -> float:
+        if self.count <= 1:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def sem(self) -> float:
+        if self.count <= 1:
+            return 0.0
+        return self.std() / math.sqrt(self.count)
+
+
 def bootstrap_percentile(
     values: List[float],
     stat_fn: Callable[[List[float]], float],
     level: float,
     n_boot: int,
     seed: int,
+    backend: str = "python",
 ) -> Tuple[float, float]:
-    rng = random.Random(seed)
     n = len(values)
     if n == 0:
         return (float("nan"), float("nan"))
+    stat_name = _vector_stat_name(stat_fn)
+    if stat_name is not None and resolve_backend(backend) == "numpy":
+        rng = np.random.default_rng(seed)
+        return _numpy_percentiles(_numpy_replicates(values, stat_name, n_boot, rng), level)
+    rng = random.Random(seed)
     stats = []
     for _ in range(n_boot):
         sample = [values[rng.randrange(n)] for _ in range(n)]
         stats.append(stat_fn(sample))
     stats.sort()
-    alpha = (1.0 - level) / 2.0
-    lo_idx = int(math.floor(alpha * (n_boot - 1)))
-    hi_idx = int(math.ceil((1.0 - alpha) * (n_boot - 1)))
+    lo_idx, hi_idx = _percentile_indices(level, n_boot)
     return (stats[lo_idx], stats[hi_idx])
 
 
@@ -77,7 +476,192 @@ def bootstrap_diff_ci(
         sample_b = [values_b[rng.randrange(n_b)] for _ in range(n_b)]
         diffs.append(stat_fn(sample_a) - stat_fn(sample_b))
     diffs.sort()
-    alpha = (1.0 - level) / 2.0
-    lo_idx = int(math.floor(alpha * (n_boot - 1)))
-    hi_idx = int(math.ceil((1.0 - alpha) * (n_boot - 1)))
+    lo_idx, hi_idx = _percentile_indices(level, n_boot)
     return (diffs[lo_idx], diffs[hi_idx])
+
+
+def bootstrap_diff_ci_batch(
+    candidates: List[List[float]],
+    baseline: List[float],
+    stat_fn: Callable[[List[float]], float],
+    level: float,
+    n_boot: int,
+    seed: int,
+    backend: str = "python",
+) -> List[Tuple[float, float]]:
+    """Bootstrap CIs of ``stat(candidate) - stat(baseline)`` for many candidates.
+
+    Each candidate's CI depends only on its own values, the baseline and
+    ``seed``, never on the other candidates. The Python backend runs
+    ``bootstrap_diff_ci`` per candidate. The NumPy backend resamples the
+    baseline once and shares its replicates; each candidate draws from its
+    own generator (see ``_candidate_rngs``). Empty candidates yield
+    ``(nan, nan)``.
+    """
+    nan_ci = (float("nan"), float("nan"))
+    results = [nan_ci] * len(candidates)
+    present = [idx for idx, values in enumerate(candidates) if values]
+    if not baseline or not present:
+        return results
+
+    stat_name = _vector_stat_name(stat_fn)
+    if stat_name is not None and resolve_backend(backend) == "numpy":
+        base_reps = _numpy_replicates(baseline, stat_name, n_boot, np.random.default_rng(seed))
+        groups = [candidates[idx] for idx in present]
+        diffs = _numpy_group_replicates(groups, stat_name, n_boot, _candidate_rngs(seed, len(groups))) - base_reps
+        lo_idx, hi_idx = _percentile_indices(level, n_boot)
+        selected = np.partition(diffs, (lo_idx, hi_idx), axis=1)
+        for pos, idx in enumerate(present):
+            results[idx] = (float(selected[pos, lo_idx]), float(selected[pos, hi_idx]))
+        return results
+
+    for idx in present:
+        results[idx] = bootstrap_diff_ci(candidates[idx], baseline, stat_fn, level, n_boot, seed)
+    return results
+
+
+def _quantile_mcse(ordered: List[float], idx: int) -> float:
+    """Monte Carlo standard error of the order statistic ``ordered[idx]``.
+
+    The rank of a sample quantile is Binomial(B, p); half the spread between
+    the order statistics one binomial SD either side of ``idx`` estimates the
+    quantile's standard error without assuming a density.
+    """
+    count = len(ordered)
+    p = idx / max(1, count - 1)
+    half = math.sqrt(count * p * (1.0 - p))
+    lo = max(0, int(math.floor(idx - half)))
+    hi = min(count - 1, int(math.ceil(idx + half)))
+    return (ordered[hi] - ordered[lo]) / 2.0
+
+
+def _percentile_source(
+    values: List[float],
+    stat_fn: Callable[[List[float]], float],
+    seed: int,
+    backend: str,
+) -> Callable[[int], List[List[float]]]:
+    stat_name = _vector_stat_name(stat_fn)
+    if stat_name is not None and resolve_backend(backend) == "numpy":
+        np_rng = np.random.default_rng(seed)
+        return lambda count: [_numpy_replicates(values, stat_name, count, np_rng).tolist()]
+    rng = random.Random(seed)
+    n = len(values)
+
+    def draw(count: int) -> List[List[float]]:
+        return [[stat_fn([values[rng.randrange(n)] for _ in range(n)]) for _ in range(count)]]
+
+    return draw
+
+
+def _diff_source(
+    candidates: List[List[float]],
+    baseline: List[float],
+    stat_fn: Callable[[List[float]], float],
+    seed: int,
+    backend: str,
+) -> Callable[[int], List[List[float]]]:
+    stat_name = _vector_stat_name(stat_fn)
+    if stat_name is not None and resolve_backend(backend) == "numpy":
+        base_rng = np.random.default_rng(seed)
+        rngs = _candidate_rngs(seed, len(candidates))
+
+        def draw_numpy(count: int) -> List[List[float]]:
+            base_reps = _numpy_replicates(baseline, stat_name, count, base_rng)
+            return (_numpy_group_replicates(candidates, stat_name, count, rngs) - base_reps).tolist()
+
+        return draw_numpy
+    # One stream per candidate, drawn as bootstrap_diff_ci does, so the
+    # first batch matches a fixed-n_boot run and candidates stay independent.
+    rngs = [random.Random(seed) for _ in candidates]
+    n_base = len(baseline)
+
+    def draw(count: int) -> List[List[float]]:
+        out = []
+        for values, rng in zip(candidates, rngs):
+            n = len(values)
+            diffs = []
+            for _ in range(count):
+                sample = [values[rng.randrange(n)] for _ in range(n)]
+                base_sample = [baseline[rng.randrange(n_base)] for _ in range(n_base)]
+                diffs.append(stat_fn(sample) - stat_fn(base_sample))
+            out.append(diffs)
+        return out
+
+    return draw
+
+
+def _adaptive_percentiles(
+    draw: Callable[[int], List[List[float]]],
+    n_series: int,
+    level: float,
+    batch: int,
+    max_boot: int,
+    precision: float,
+) -> Tuple[List[Tuple[float, float]], int]:
+    series: List[List[float]] = [[] for _ in range(n_series)]
+    while True:
+        count = min(batch, max_boot - len(series[0]))
+        for reps, new in zip(series, draw(count)):
+            reps.extend(new)
+        total = len(series[0])
+        lo_idx, hi_idx = _percentile_indices(level, total)
+        cis = []
+        worst = 0.0
+        for reps in series:
+            reps.sort()
+            cis.append((reps[lo_idx], reps[hi_idx]))
+            worst = max(worst, _quantile_mcse(reps, lo_idx), _quantile_mcse(reps, hi_idx))
+        if worst <= precision or total >= max_boot:
+            return cis, total
+
+
+def bootstrap_percentile_adaptive(
+    values: List[float],
+    stat_fn: Callable[[List[float]], float],
+    level: float,
+    batch: int,
+    max_boot: int,
+    precision: float,
+    seed: int,
+    backend: str = "python",
+) -> Tuple[float, float, int]:
+    """Percentile CI drawn in batches until both endpoints have converged.
+
+    Replicates are added ``batch`` at a time until the Monte Carlo standard
+    error of each endpoint is at most ``precision`` or ``max_boot`` replicates
+    have been drawn. Returns ``(lo, hi, replicates_used)``.
+    """
+    if not values:
+        return (float("nan"), float("nan"), 0)
+    draw = _percentile_source(values, stat_fn, seed, backend)
+    cis, used = _adaptive_percentiles(draw, 1, level, batch, max_boot, precision)
+    return (cis[0][0], cis[0][1], used)
+
+
+def bootstrap_diff_ci_batch_adaptive(
+    candidates: List[List[float]],
+    baseline: List[float],
+    stat_fn: Callable[[List[float]], float],
+    level: float,
+    batch: int,
+    max_boot: int,
+    precision: float,
+    seed: int,
+    backend: str = "python",
+) -> Tuple[List[Tuple[float, float]], int]:
+    """Adaptive form of ``bootstrap_diff_ci_batch``.
+
+    Candidates draw batches as in ``bootstrap_diff_ci_batch`` and stop
+    together, once every endpoint has converged. Returns ``(cis, replicates_used)``.
+    """
+    nan_ci = (float("nan"), float("nan"))
+    results = [nan_ci] * len(candidates)
+    present = [idx for idx, values in enumerate(candidates) if values]
+    if not baseline or not present:
+        return results, 0
+    draw = _diff_source([candidates[idx] for idx in present], baseline, stat_fn, seed, backend)
+    cis, used = _adaptive_percentiles(draw, len(present), level, batch, max_boot, precision)
+    for idx, ci in zip(present, cis):
+        results[idx] = ci
+    return results, used